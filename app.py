@@ -0,0 +1,41 @@
+# Supplier evaluation: one multipage Streamlit app (streamlit run app.py)
+#
+# Only the selected page's script runs on a rerun, and each page imports what
+# it needs, so matplotlib, for one, is loaded only once a charting page opens.
+import streamlit as st
+
+from supplier_db import DuplicateSuppliersError, init_db
+from supplier_timing import span, start_rerun
+from supplier_views import render_timing_panel, select_tenant
+
+# url path -> (script, title, icon), in navigation order
+PAGES = {
+    "suppliers": ("app_pages/suppliers.py", "Suppliers", "📋"),
+    "ranking": ("app_pages/ranking.py", "AHP & TOPSIS Ranking", "📊"),
+    "trends": ("app_pages/trends.py", "Trends & Portfolio", "📈"),
+    "admin": ("app_pages/admin.py", "All Workspaces", "🏢"),
+}
+
+
+def run_app(default="suppliers"):
+    """Shared sidebar (workspace picker), then the selected page; `default` is shown at the root URL."""
+    st.set_page_config(page_title="Supplier Evaluation", layout="wide")
+    page = st.navigation([
+        st.Page(script, title=title, icon=icon, url_path=name, default=name == default)
+        for name, (script, title, icon) in PAGES.items()
+    ])
+    start_rerun(page.url_path or default, profile=st.session_state.get("timing_profile", False))
+    # pages read the workspace database from here
+    st.session_state["db_path"] = select_tenant()
+    with span("init_db"):
+        try:
+            init_db(st.session_state["db_path"])
+        except DuplicateSuppliersError as exc:
+            st.error(f"This workspace ({st.session_state['db_path']}) cannot be opened yet: {exc}")
+            st.stop()
+    page.run()
+    render_timing_panel()
+
+
+if __name__ == "__main__":
+    run_app()
@@ -0,0 +1,10 @@
+# Admin overview: totals across every team workspace
+import streamlit as st
+
+from supplier_timing import span
+from supplier_views import render_tenant_overview
+
+st.title("🏢 All Workspaces")
+st.markdown("Totals across every team database, read from their rollup tables in ATTACH batches.")
+with span("tenant overview"):
+    render_tenant_overview()
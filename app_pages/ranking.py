@@ -0,0 +1,116 @@
+# AHP-weighted TOPSIS ranking: weights, intermediate steps, shortlist and robustness checks
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from supplier_charts import MAX_LABELS, bubble_chart_png
+from supplier_db import frontier_ids, suppliers_snapshot
+from supplier_scoring import (
+    CRITERIA, ahp_weights, decision_matrix, ranking_engine, shortlist_ranking, top_k_indices, topsis, topsis_steps,
+)
+from supplier_timing import span
+from supplier_views import (
+    render_constraints, render_empty_shortlist, render_monte_carlo, render_segmented_ranking, render_sensitivity,
+    render_timing_panel,
+)
+
+db_path = st.session_state["db_path"]
+st.title("📈 Supplier Ranking using AHP + TOPSIS")
+
+# --- LOAD DATA ---
+with span("load suppliers"):
+    df, version = suppliers_snapshot(db_path)
+
+if df.empty:
+    st.warning("No suppliers found. Please enter supplier data first.")
+    render_timing_panel()
+    st.stop()
+
+# --- AHP Pairwise Input ---
+st.subheader("🎛 Define AHP Pairwise Preferences")
+st.markdown("Rate the importance of one criterion relative to another (1 = equal, 9 = extremely more important)")
+criteria = CRITERIA
+
+# Create pairwise matrix input with sliders
+pairwise_matrix = np.ones((4, 4))
+labels = [(i, j) for i in range(4) for j in range(i+1, 4)]
+for i, j in labels:
+    val = st.slider(f"How important is '{criteria[i]}' vs '{criteria[j]}'?", 1, 9, 1)
+    pairwise_matrix[i, j] = val
+    pairwise_matrix[j, i] = 1 / val
+
+# Compute weights from pairwise matrix using AHP
+with span("AHP weights"):
+    weights = ahp_weights(pairwise_matrix)
+st.write("### 🧠 AHP Derived Weights")
+st.dataframe(pd.DataFrame({"Criteria": criteria, "Weight": weights.round(4)}))
+
+# --- TOPSIS STEPS ---
+if st.checkbox("Show intermediate TOPSIS steps (Steps 1-5)"):
+    with span("TOPSIS steps"):
+        matrix = decision_matrix(df)
+        steps = topsis_steps(matrix, weights)
+
+    st.subheader("🔍 Step 1: Decision Matrix")
+    st.dataframe(pd.DataFrame(matrix, columns=criteria).style.format("{:.2f}"))
+
+    st.subheader("⚙️ Step 2: Normalized Matrix")
+    st.dataframe(pd.DataFrame(steps["normalized"], columns=criteria).style.format("{:.4f}"))
+
+    st.subheader("⚖️ Step 3: Weighted Normalized Matrix (AHP Driven)")
+    st.dataframe(pd.DataFrame(steps["weighted"], columns=criteria).style.format("{:.4f}"))
+
+    st.subheader("🌟 Step 4: Ideal & Negative-Ideal Solutions")
+    st.dataframe(pd.Series(steps["ideal"], index=criteria, name="Ideal Value"))
+    st.dataframe(pd.Series(steps["nadir"], index=criteria, name="Negative-Ideal Value"))
+
+    st.subheader("📏 Step 5: Distance to Ideal/Nadir")
+    st.dataframe(pd.DataFrame({"Supplier": df["name"], "Distance to Ideal": steps["d_pos"], "Distance to Nadir": steps["d_neg"]}))
+
+# --- CLOSENESS ---
+st.subheader("📊 Step 6: Closeness Score and Ranking")
+with st.expander("🚧 Hard limits (rank only the suppliers that pass)"):
+    constraints, top_k = render_constraints()
+with span("TOPSIS ranking"):
+    engine = ranking_engine(db_path)
+    if constraints:
+        names, closeness = shortlist_ranking(db_path, weights, constraints, k=top_k)
+    else:
+        names, closeness = engine.labelled_scores(weights)
+        order = top_k_indices(closeness, top_k)
+        names, closeness = [names[i] for i in order], closeness[order]
+if constraints and not names:
+    render_empty_shortlist(db_path, constraints)
+else:
+    df_topsis = pd.DataFrame({"name": names, "TOPSIS Score": closeness})
+    df_topsis["Rank"] = df_topsis["TOPSIS Score"].rank(ascending=False, method="min").astype(int)
+    st.dataframe(df_topsis[["name", "TOPSIS Score", "Rank"]])
+
+# --- SEGMENTED RANKING ---
+with st.expander("🗺 Ranking per market or risk class"), span("segmented ranking"):
+    render_segmented_ranking(db_path, weights)
+
+# --- WEIGHT SENSITIVITY ---
+with st.expander("🎲 How stable is this ranking? (weight sensitivity)"), span("weight sensitivity"):
+    render_sensitivity(*engine.snapshot(), pairwise_matrix)
+
+# --- EMISSIONS UNCERTAINTY ---
+with st.expander("🌫 Emissions uncertainty (Monte Carlo)"), span("Monte Carlo"):
+    render_monte_carlo(df, weights)
+
+# --- BUBBLE CHART ---
+st.subheader("🎯 Visualization: Cost vs Emissions Bubble Chart")
+chart_df, chart_version = df, (db_path, version)
+if st.checkbox("Pareto frontier only", key="chart_frontier"):
+    with span("Pareto frontier"):
+        chart_df = df[df["id"].isin(frontier_ids(db_path))]
+    chart_version += ("frontier",)
+# the TOPSIS order only matters once some suppliers go unlabelled; below that
+# every slider change reuses the same cached image
+ranked = len(chart_df) > MAX_LABELS
+with span("bubble chart"):
+    st.image(bubble_chart_png(
+        chart_df, chart_version,
+        priority=(lambda: topsis(decision_matrix(chart_df), weights)) if ranked else None,
+        priority_key=tuple(np.round(weights, 6)) if ranked else None,
+    ))
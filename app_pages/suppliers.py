@@ -0,0 +1,39 @@
+# Supplier entry, bulk import, the supplier grid and the cost vs emissions chart
+import streamlit as st
+
+from supplier_charts import bubble_chart_png
+from supplier_db import frontier_ids, suppliers_snapshot
+from supplier_timing import span
+from supplier_views import render_bulk_import, render_supplier_form, render_supplier_grid
+
+db_path = st.session_state["db_path"]
+st.title("🌍 Supplier Cost & Emissions Tracker")
+
+# --- SUPPLIER FORM ---
+st.subheader("📋 Enter Supplier Information")
+render_supplier_form(db_path)
+
+# --- BULK IMPORT ---
+st.markdown("### 📥 Bulk Import")
+render_bulk_import(db_path)
+
+# --- DATAFRAME + VISUAL ---
+st.markdown("---")
+st.subheader("📊 All Supplier Entries")
+with span("supplier grid"):
+    render_supplier_grid(db_path)
+with span("load suppliers"):
+    df, version = suppliers_snapshot(db_path)
+
+# --- Bubble Chart ---
+st.markdown("### 🎯 Supplier Cost vs Emissions Bubble Chart")
+if not df.empty:
+    chart_df, chart_version = df, (db_path, version)
+    if st.checkbox("Pareto frontier only", key="chart_frontier"):
+        with span("Pareto frontier"):
+            chart_df = df[df["id"].isin(frontier_ids(db_path))]
+        chart_version += ("frontier",)
+    with span("bubble chart"):
+        st.image(bubble_chart_png(chart_df, chart_version))
+else:
+    st.info("No data available to visualize yet. Please add suppliers.")
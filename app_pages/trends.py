@@ -0,0 +1,10 @@
+# Trends and portfolio dashboard, read from the rollup tables only
+import streamlit as st
+
+from supplier_timing import span
+from supplier_views import render_dashboard
+
+st.title("📈 Trends & Portfolio")
+st.markdown("Spend, emissions and risk mix over time, from pre-aggregated rollups.")
+with span("dashboard"):
+    render_dashboard(st.session_state["db_path"])
@@ -0,0 +1,176 @@
+# Benchmark suite: insert, load, rank and render at realistic scales
+#
+#   python benchmarks/run_benchmarks.py                       # 1k / 100k / 1M rows
+#   python benchmarks/run_benchmarks.py --sizes 1000,100000 --compare benchmarks/results/old.json
+#
+# Every run writes a JSON file (timings plus commit and environment) to
+# benchmarks/results/, so two commits can be compared with --compare.
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+# synthetic puts the repository root on sys.path, so it is imported first
+from synthetic import generate_suppliers, supplier_dict, supplier_rows
+
+import supplier_db
+from supplier_charts import bubble_chart, render_png
+from supplier_scoring import ahp_weights, streaming_topsis, topsis
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+DEFAULT_SIZES = [1000, 100_000, 1_000_000]
+# Form saves commit one row each; a few hundred are enough for a stable rate
+SINGLE_INSERTS = 300
+# Slower than the baseline by more than this ratio is reported as a regression
+REGRESSION_RATIO = 1.2
+# ...unless both timings are below this, where scheduler noise dominates
+NOISE_SECONDS = 0.01
+PAIRWISE = np.array([
+    [1, 3, 5, 7],
+    [1 / 3, 1, 3, 5],
+    [1 / 5, 1 / 3, 1, 3],
+    [1 / 7, 1 / 5, 1 / 3, 1],
+])
+
+
+def timed(func, repeat):
+    """Median and best wall time of `repeat` calls, plus the last result."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return {"seconds": statistics.median(times), "best": min(times), "repeat": repeat}, result
+
+
+# --- BENCHMARKS ---
+def bench_size(n, workdir, repeat, seed):
+    """All benchmarks for one table size; returns {name: timing}."""
+    results = {}
+    db_path = os.path.join(workdir, f"bench_{n}.db")
+    cols = generate_suppliers(n, seed)
+    rows = supplier_rows(cols)
+    supplier_db.init_db(db_path)
+
+    def bulk_insert():
+        with supplier_db.open_db(db_path) as db, db.write() as conn:
+            supplier_db.insert_suppliers(conn, rows)
+
+    results["insert_bulk"], _ = timed(bulk_insert, 1)
+    results["insert_bulk"]["rows_per_sec"] = n / results["insert_bulk"]["seconds"]
+
+    def load_full():
+        import pandas as pd
+
+        with supplier_db.open_db(db_path) as db, db.read() as conn:
+            return pd.read_sql_query(supplier_db.SUPPLIERS_SQL, conn)
+
+    results["load_full"], df = timed(load_full, repeat)
+    filters = {"country": "France", "risks": ["High"]}
+    results["load_filtered_page"], _ = timed(
+        lambda: (supplier_db.count_suppliers(db_path, filters),
+                 supplier_db.query_suppliers_page(db_path, filters, sort_by="total_cost")), repeat)
+    results["load_decision_matrix"], (_, matrix) = timed(lambda: supplier_db.load_decision_matrix(db_path), repeat)
+
+    results["rank_ahp_topsis"], _ = timed(lambda: topsis(matrix, ahp_weights(PAIRWISE)), repeat)
+    weights = ahp_weights(PAIRWISE)
+    results["rank_streaming"], _ = timed(lambda: sum(len(s) for _, s in streaming_topsis(db_path, weights)), repeat)
+
+    priority = topsis(matrix, weights)
+    results["render_bubble_chart"], _ = timed(lambda: render_png(bubble_chart(df, priority=priority)), repeat)
+    return results
+
+
+def bench_single_inserts(workdir, seed):
+    """Rows per second through save_supplier (one transaction per row, as the form does)."""
+    db_path = os.path.join(workdir, "bench_single.db")
+    cols = generate_suppliers(SINGLE_INSERTS, seed)
+    supplier_db.get_db(db_path)
+    start = time.perf_counter()
+    for i in range(SINGLE_INSERTS):
+        supplier_db.save_supplier(supplier_dict(cols, i), db_path)
+    seconds = time.perf_counter() - start
+    return {"seconds": seconds, "best": seconds, "repeat": 1, "rows": SINGLE_INSERTS,
+            "rows_per_sec": SINGLE_INSERTS / seconds}
+
+
+# --- REPORTING ---
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(RESULTS_DIR), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(current, baseline):
+    """Print per-benchmark ratios against a previous results file; returns the regressions."""
+    regressions = []
+    print(f"\n{'benchmark':<32}{'baseline':>12}{'current':>12}{'ratio':>8}")
+    for key, timing in current["results"].items():
+        before = baseline["results"].get(key)
+        if before is None:
+            continue
+        ratio = timing["seconds"] / before["seconds"] if before["seconds"] else float("inf")
+        noisy = max(timing["seconds"], before["seconds"]) < NOISE_SECONDS
+        flag = "  <-- slower" if ratio > REGRESSION_RATIO and not noisy else ""
+        print(f"{key:<32}{before['seconds']:>12.4f}{timing['seconds']:>12.4f}{ratio:>8.2f}{flag}")
+        if flag:
+            regressions.append(key)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Supplier app benchmark suite")
+    parser.add_argument("--sizes", default=",".join(str(n) for n in DEFAULT_SIZES),
+                        help="Comma-separated table sizes (default: 1k, 100k, 1M)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per timing; the median is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<timestamp>-<commit>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    report = {"environment": environment(), "results": {}}
+    with tempfile.TemporaryDirectory() as workdir:
+        report["results"]["insert_single"] = bench_single_inserts(workdir, args.seed)
+        for n in (int(size) for size in args.sizes.split(",")):
+            for name, timing in bench_size(n, workdir, args.repeat, args.seed).items():
+                report["results"][f"{name}@{n}"] = timing
+                print(f"{name + '@' + str(n):<32}{timing['seconds']:>10.4f}s", flush=True)
+        supplier_db.close_all()
+
+    env = report["environment"]
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{env['timestamp'].replace(':', '')}-{env['commit'] or 'nogit'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f))
+        if regressions:
+            sys.exit(f"{len(regressions)} benchmark(s) slower than {REGRESSION_RATIO}x the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# Reproducible synthetic suppliers matching the `suppliers` schema
+import os
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from supplier_calc import compute_totals
+from supplier_db import SUPPLIER_COLUMNS
+
+COUNTRIES = ["Germany", "France", "Italy", "Spain", "Poland", "Netherlands", "China", "India",
+             "Vietnam", "Brazil", "Turkey", "United States", "Mexico", "Portugal", "Sweden"]
+CITIES_PER_COUNTRY = 20
+
+
+def generate_suppliers(n, seed=0):
+    """Column dict (SUPPLIER_COLUMNS order) of `n` plausible suppliers, totals included.
+
+    The same (n, seed) always produces the same rows, ids and timestamps.
+    """
+    rng = np.random.default_rng(seed)
+    country = rng.integers(0, len(COUNTRIES), n)
+    city = rng.integers(0, CITIES_PER_COUNTRY, n)
+    risk = rng.choice(3, n, p=[0.5, 0.3, 0.2])
+    reusable = rng.random(n) < 0.3
+    cols = {
+        "id": [row.tobytes() for row in rng.integers(0, 256, (n, 16), dtype=np.uint8)],
+        "name": [f"Supplier {i:07d}" for i in range(n)],
+        "location_city": [f"{COUNTRIES[c]} City {k}" for c, k in zip(country, city)],
+        "location_country": [COUNTRIES[c] for c in country],
+        "quantity_units": rng.integers(100, 100_000, n).astype(np.float64),
+        "price_per_unit": rng.uniform(0.05, 5.0, n),
+        "unit_weight_kg": rng.uniform(0.01, 2.0, n),
+        "distance_sea_km": np.where(rng.random(n) < 0.4, rng.uniform(500, 20_000, n), 0.0),
+        "distance_road_km": rng.uniform(10, 2000, n),
+        "distance_air_km": np.where(rng.random(n) < 0.05, rng.uniform(500, 10_000, n), 0.0),
+        "delivery_cost_sea": rng.uniform(0.001, 0.05, n),
+        "delivery_cost_road": rng.uniform(0.5, 3.0, n),
+        "end_of_life_cost_per_kg": rng.uniform(0.0, 0.5, n),
+        "emission_factor_prod": rng.uniform(0.1, 3.0, n),
+        "emission_factor_sea": rng.uniform(0.01, 0.03, n),
+        "emission_factor_road": rng.uniform(0.05, 0.15, n),
+        "emission_factor_air": rng.uniform(0.5, 1.5, n),
+        "emission_factor_eol": rng.uniform(0.0, 0.5, n),
+        "deforestation_risk": (risk + 1).tolist(),
+        "reusable": reusable.astype(int).tolist(),
+        "reuse_count": np.where(reusable, rng.integers(2, 50, n), 0).astype(np.float64),
+        "return_km": np.where(reusable, rng.uniform(10, 1000, n), 0.0),
+        "recyclability": (rng.random(n) < 0.6).astype(int).tolist(),
+        "recycled_materials": (rng.random(n) < 0.4).astype(int).tolist(),
+    }
+    cols.update(compute_totals(cols))
+    start = datetime(2024, 1, 1)
+    seconds = np.sort(rng.integers(0, 365 * 24 * 3600, n))
+    cols["created_at"] = [(start + timedelta(seconds=int(s))).isoformat() for s in seconds]
+    return cols
+
+
+def supplier_rows(cols):
+    """Row tuples ready for supplier_db.insert_suppliers."""
+    values = [cols[col].tolist() if isinstance(cols[col], np.ndarray) else cols[col] for col in SUPPLIER_COLUMNS]
+    return list(zip(*values))
+
+
+def supplier_dict(cols, i):
+    """Row `i` as the dict the entry form passes to save_supplier."""
+    values = {col: cols[col][i] for col in SUPPLIER_COLUMNS[1:-1]}
+    # numpy scalars would be stored as BLOBs by sqlite3
+    return {col: value.item() if isinstance(value, np.generic) else value for col, value in values.items()}
@@ -0,0 +1,136 @@
+# Vectorized cost & emissions engine shared by the supplier apps
+import numpy as np
+
+# Columns whose values can be revised in bulk by recompute_all_totals
+FACTOR_COLUMNS = [
+    "emission_factor_prod",
+    "emission_factor_sea",
+    "emission_factor_road",
+    "emission_factor_air",
+    "emission_factor_eol",
+    "price_per_unit",
+    "delivery_cost_sea",
+    "delivery_cost_road",
+    "end_of_life_cost_per_kg",
+]
+
+
+def _col(cols, key):
+    return np.asarray(cols[key], dtype=np.float64)
+
+
+# --- REUSE ADJUSTMENT ---
+def reuse_mask(cols):
+    """Rows where the reuse adjustment applies (reusable, with reuse count and return km)."""
+    reuse_count = _col(cols, "reuse_count")
+    return_km = _col(cols, "return_km")
+    return (_col(cols, "reusable") != 0) & (reuse_count != 0) & (return_km != 0)
+
+
+def apply_reuse_adjustment(cols):
+    """Return the adjusted (distance_road_km, emission_factor_prod) columns."""
+    reused = reuse_mask(cols)
+    reuse_count = _col(cols, "reuse_count")
+    distance_road_km = _col(cols, "distance_road_km") + np.where(reused, reuse_count * _col(cols, "return_km"), 0.0)
+    emission_factor_prod = _col(cols, "emission_factor_prod") / np.where(reused, reuse_count, 1.0)
+    return distance_road_km, emission_factor_prod
+
+
+# --- TOTALS ---
+def compute_totals(cols):
+    """Compute total_cost / total_emissions for whole columns in one pass.
+
+    `cols` is any mapping of column name to array-like (a dict, a DataFrame, ...).
+    The road distance and production factor are adjusted for reuse first, as
+    the form does before saving.
+    """
+    distance_road_km, emission_factor_prod = apply_reuse_adjustment(cols)
+
+    quantity_units = _col(cols, "quantity_units")
+    distance_sea_km = _col(cols, "distance_sea_km")
+    total_weight_kg = _col(cols, "unit_weight_kg") * quantity_units
+    total_weight_tonnes = total_weight_kg / 1000.0
+
+    total_cost = (
+        quantity_units * _col(cols, "price_per_unit") +
+        distance_sea_km * _col(cols, "delivery_cost_sea") +
+        distance_road_km * _col(cols, "delivery_cost_road") +
+        _col(cols, "end_of_life_cost_per_kg") * total_weight_kg
+    )
+
+    total_emissions = (
+        emission_factor_prod * quantity_units +
+        _col(cols, "emission_factor_sea") * total_weight_tonnes * distance_sea_km +
+        _col(cols, "emission_factor_road") * total_weight_tonnes * distance_road_km +
+        _col(cols, "emission_factor_air") * total_weight_tonnes * _col(cols, "distance_air_km") +
+        _col(cols, "emission_factor_eol") * quantity_units
+    )
+
+    return {
+        "distance_road_km": distance_road_km,
+        "emission_factor_prod": emission_factor_prod,
+        "total_cost": total_cost,
+        "total_emissions": total_emissions,
+    }
+
+
+def compute_supplier_totals(data):
+    """Scalar wrapper for a single form submission; returns plain floats."""
+    return {key: float(value) for key, value in compute_totals(data).items()}
+
+
+# --- SET-BASED RECOMPUTE ---
+def totals_sql(expr):
+    """(total_cost, total_emissions) SQL expressions, the same formulas as compute_totals.
+
+    `expr` maps each input column to the SQL expression to use for it (the
+    column itself, a bound parameter, ...). No reuse adjustment is applied.
+    """
+    weight_kg = f"({expr['unit_weight_kg']} * {expr['quantity_units']})"
+    total_cost = (
+        f"{expr['quantity_units']} * {expr['price_per_unit']} + "
+        f"{expr['distance_sea_km']} * {expr['delivery_cost_sea']} + "
+        f"{expr['distance_road_km']} * {expr['delivery_cost_road']} + "
+        f"{expr['end_of_life_cost_per_kg']} * {weight_kg}"
+    )
+    total_emissions = (
+        f"{expr['emission_factor_prod']} * {expr['quantity_units']} + "
+        f"({expr['emission_factor_sea']} * {expr['distance_sea_km']} + "
+        f"{expr['emission_factor_road']} * {expr['distance_road_km']} + "
+        f"{expr['emission_factor_air']} * {expr['distance_air_km']}) * {weight_kg} / 1000.0 + "
+        f"{expr['emission_factor_eol']} * {expr['quantity_units']}"
+    )
+    return total_cost, total_emissions
+
+
+def recompute_all_totals(conn, overrides=None):
+    """Recompute total_cost / total_emissions for every row in a single UPDATE.
+
+    `overrides` maps columns from FACTOR_COLUMNS to revised values that are
+    written to all rows in the same statement. A revised production factor is
+    divided by reuse_count for reused rows, matching what the form stores.
+    Run it inside a write transaction. Returns the number of rows updated.
+    """
+    overrides = dict(overrides or {})
+    unknown = set(overrides) - set(FACTOR_COLUMNS)
+    if unknown:
+        raise ValueError(f"Cannot override column(s): {', '.join(sorted(unknown))}")
+
+    names = [
+        "quantity_units", "unit_weight_kg", "distance_sea_km", "distance_road_km", "distance_air_km",
+    ] + FACTOR_COLUMNS
+    expr = {name: name for name in names}
+    for name in overrides:
+        expr[name] = f":{name}"
+    if "emission_factor_prod" in overrides:
+        expr["emission_factor_prod"] = (
+            "(CASE WHEN reusable <> 0 AND reuse_count <> 0 AND return_km <> 0 "
+            "THEN :emission_factor_prod / reuse_count ELSE :emission_factor_prod END)"
+        )
+
+    total_cost, total_emissions = totals_sql(expr)
+    assignments = [f"{name} = {expr[name]}" for name in overrides]
+    assignments += [f"total_cost = {total_cost}", f"total_emissions = {total_emissions}"]
+
+    cursor = conn.execute(f"UPDATE suppliers SET {', '.join(assignments)}", overrides)
+    return cursor.rowcount
@@ -0,0 +1,146 @@
+# Cost vs emissions bubble chart shared by the supplier apps
+import io
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+
+from supplier_timing import span
+
+# Indexed by deforestation_risk (1 = Low, 2 = Medium, 3 = High); anything else is gray
+RISK_PALETTE = np.array(["gray", "green", "orange", "red"])
+RISK_LABELS = {"red": "High Deforestation Risk", "orange": "Medium Deforestation Risk",
+               "green": "Low Deforestation Risk"}
+
+# Above this many suppliers points are aggregated into hexagonal bins
+HEXBIN_THRESHOLD = 5000
+MAX_LABELS = 30
+# Only the first candidates (by priority) are considered for a label
+LABEL_CANDIDATES = 2000
+FONT_SIZE = 9
+# Total size of cached PNGs before least-recently-used charts are evicted
+CHART_CACHE_BYTES = 32 * 1024 * 1024
+
+
+def risk_colors(deforestation_risk):
+    score = np.nan_to_num(np.asarray(deforestation_risk, dtype=np.float64)).astype(int)
+    return RISK_PALETTE[np.where((score >= 1) & (score <= 3), score, 0)]
+
+
+def _label_candidates(n, priority):
+    if priority is None:
+        return np.arange(min(n, LABEL_CANDIDATES))
+    priority = np.asarray(priority, dtype=np.float64)
+    count = min(n, LABEL_CANDIDATES)
+    if count == 0:
+        return np.arange(0)
+    top = np.argpartition(-priority, count - 1)[:count]
+    return top[np.argsort(-priority[top], kind="stable")]
+
+
+def _place_labels(ax, x, y, names, candidates, max_labels):
+    """Greedily label candidates whose text box does not overlap an accepted one (display coords)."""
+    ax.autoscale_view()
+    points = ax.transData.transform(np.column_stack([x[candidates], y[candidates]]))
+    scale = ax.figure.dpi / 72.0
+    height = FONT_SIZE * 1.2 * scale
+    boxes = []
+    for (px, py), i in zip(points, candidates):
+        if len(boxes) == max_labels:
+            break
+        name = str(names[i])
+        box = (px + 4, py - height / 2, px + 4 + 0.6 * FONT_SIZE * scale * len(name), py + height / 2)
+        if any(box[0] < b[2] and b[0] < box[2] and box[1] < b[3] and b[1] < box[3] for b in boxes):
+            continue
+        boxes.append(box)
+        ax.annotate(name, (x[i], y[i]), xytext=(4, 0), textcoords="offset points",
+                    fontsize=FONT_SIZE, va="center")
+
+
+def bubble_chart(df, priority=None, max_labels=MAX_LABELS, hexbin_threshold=HEXBIN_THRESHOLD):
+    """Cost vs emissions chart: one scatter call, colour = deforestation risk.
+
+    Only non-overlapping labels are drawn, taken in `priority` order (e.g. the
+    TOPSIS score, higher first) when given. Past `hexbin_threshold` suppliers
+    the points are aggregated into hexagonal bins so render time stays flat,
+    and only the top-priority suppliers are drawn individually.
+    """
+    x = df["total_emissions"].to_numpy(dtype=np.float64)
+    y = df["total_cost"].to_numpy(dtype=np.float64)
+    names = df["name"].to_numpy()
+    colors = risk_colors(df["deforestation_risk"])
+    n = len(df)
+
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    candidates = _label_candidates(n, priority)
+    if n > hexbin_threshold:
+        cells = ax.hexbin(x, y, gridsize=60, bins="log", mincnt=1, cmap="Greys")
+        fig.colorbar(cells, ax=ax, label="Suppliers per cell")
+        highlight = candidates[:max_labels]
+        ax.scatter(x[highlight], y[highlight], s=80, alpha=0.9, edgecolors="k", c=colors[highlight], marker="o")
+        title = f"Supplier Cost vs Emissions ({n} suppliers, density; top {len(highlight)} highlighted)"
+        candidates = highlight
+    else:
+        ax.scatter(x, y, s=200, alpha=0.6, edgecolors="w", c=colors, marker="o")
+        title = "Supplier Cost vs Emissions (Bubble Color = Deforestation Risk)"
+    _place_labels(ax, x, y, names, candidates, max_labels)
+
+    legend_elements = [
+        Line2D([0], [0], marker="o", color="w", label=label, markerfacecolor=color, markersize=10)
+        for color, label in RISK_LABELS.items()
+    ]
+    ax.legend(handles=legend_elements, title="Deforestation Risk")
+    ax.set_xlabel("Total Emissions (kg CO₂)")
+    ax.set_ylabel("Total Cost (€)")
+    ax.set_title(title)
+    ax.grid(True)
+    return fig
+
+
+# --- RENDERED CHART CACHE ---
+_png_cache = OrderedDict()
+_png_cache_lock = threading.Lock()
+_png_cache_bytes = 0
+
+
+def render_png(fig, dpi=200):
+    """Encode a figure as PNG (same settings as st.pyplot) and release it."""
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+    finally:
+        fig.clear()
+    return buffer.getvalue()
+
+
+def bubble_chart_png(df, version, priority=None, priority_key=None, **options):
+    """PNG bytes of bubble_chart, cached on (data version, priority key, options).
+
+    `version` must identify the rows in `df` (e.g. (db_path, data_version) from
+    suppliers_snapshot) and `priority_key` whatever `priority` was derived from,
+    such as the AHP weights. `priority` may be a callable so it is only computed
+    on a cache miss. The cache is LRU, bounded by CHART_CACHE_BYTES.
+    """
+    key = ("bubble", version, priority_key, tuple(sorted(options.items())))
+    with _png_cache_lock:
+        png = _png_cache.get(key)
+        if png is not None:
+            _png_cache.move_to_end(key)
+            return png
+
+    with span("render chart (cache miss)"):
+        if callable(priority):
+            priority = priority()
+        png = render_png(bubble_chart(df, priority=priority, **options))
+    global _png_cache_bytes
+    with _png_cache_lock:
+        if key not in _png_cache:
+            _png_cache[key] = png
+            _png_cache_bytes += len(png)
+        while _png_cache_bytes > CHART_CACHE_BYTES and len(_png_cache) > 1:
+            _, evicted = _png_cache.popitem(last=False)
+            _png_cache_bytes -= len(evicted)
+    return png
@@ -0,0 +1,183 @@
+# Command line for batch supplier jobs: rank, import, distances, recompute, compact
+#
+# Heavy modules (numpy, pandas, openpyxl) are imported inside each command so
+# that start-up stays fast; Streamlit and matplotlib are never imported.
+import argparse
+import os
+import sys
+
+DEFAULT_DB = "supplier_data.db"
+# same default as supplier_geo.DESTINATION, without importing numpy at start-up
+DEFAULT_DESTINATION = os.environ.get("SUPPLIER_DESTINATION", "Rotterdam, Netherlands")
+DESTINATION_HELP = f"Delivery point as 'City, Country' from the gazetteer (default: {DEFAULT_DESTINATION})"
+
+
+def _floats(text):
+    return [float(value) for value in text.split(",")]
+
+
+# argparse turns ArgumentTypeError into a usage error naming the option
+def _override(text):
+    """COLUMN=VALUE for recompute --set, as a (column, float) pair."""
+    name, sep, value = text.partition("=")
+    if not sep or not name.strip():
+        raise argparse.ArgumentTypeError(f"expected COLUMN=VALUE, got {text!r}")
+    try:
+        return name.strip(), float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{name.strip()} needs a number, got {value!r}") from None
+
+
+def _supplier_file(path):
+    """Path of an existing, non-empty supplier list."""
+    if not os.path.isfile(path):
+        raise argparse.ArgumentTypeError(f"no such file: {path}")
+    if os.path.getsize(path) == 0:
+        raise argparse.ArgumentTypeError(f"{path} is empty")
+    return path
+
+
+# --- COMMANDS ---
+def cmd_rank(args):
+    import numpy as np
+
+    from supplier_db import load_decision_matrix
+    from supplier_scoring import CRITERIA, ahp_weights, streaming_top_k, topsis
+
+    m = len(CRITERIA)
+    if args.weights:
+        weights = np.asarray(_floats(args.weights))
+        if len(weights) != m:
+            sys.exit(f"--weights needs {m} values ({', '.join(CRITERIA)})")
+        weights = weights / weights.sum()
+    else:
+        upper = _floats(args.pairwise) if args.pairwise else [1.0] * (m * (m - 1) // 2)
+        if len(upper) != m * (m - 1) // 2:
+            sys.exit(f"--pairwise needs {m * (m - 1) // 2} values (upper triangle, row by row)")
+        pairwise = np.ones((m, m))
+        rows, cols = np.triu_indices(m, k=1)
+        pairwise[rows, cols] = upper
+        pairwise[cols, rows] = 1.0 / np.asarray(upper)
+        weights = ahp_weights(pairwise)
+
+    if args.stream:
+        if not args.top:
+            sys.exit("--stream needs --top")
+        dtype = np.float32 if args.float32 else np.float64
+        names, scores = streaming_top_k(args.db, weights, args.top, dtype=dtype)
+        order = range(len(names))
+    else:
+        names, matrix = load_decision_matrix(args.db)
+        scores = topsis(matrix, weights)
+        order = np.argsort(-scores, kind="stable")
+        if args.top:
+            order = order[:args.top]
+
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        out.write("rank,name,score\n")
+        for rank, i in enumerate(order, start=1):
+            name = str(names[i]).replace('"', '""')
+            out.write(f'{rank},"{name}",{scores[i]:.6f}\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+def cmd_import(args):
+    from supplier_import import import_suppliers
+
+    mode = None if args.estimate == "off" else args.estimate
+    report = import_suppliers(args.path, args.db, chunksize=args.chunksize, distance_mode=mode,
+                              destination=args.destination)
+    print(
+        f"Imported {report['imported']} supplier(s), rejected {report['rejected']} "
+        f"in {report['seconds']:.2f}s ({report['rows_per_sec']:.0f} rows/sec); "
+        f"distances estimated for {report['distances_estimated']}"
+    )
+
+
+def cmd_distances(args):
+    from supplier_geo import fill_supplier_distances
+
+    filled = fill_supplier_distances(args.db, args.destination, args.mode)
+    print(f"Estimated distances for {filled} supplier(s) towards {args.destination}")
+
+
+def cmd_recompute(args):
+    from supplier_calc import recompute_all_totals
+    from supplier_db import open_db
+
+    try:
+        with open_db(args.db) as db, db.write() as conn:
+            updated = recompute_all_totals(conn, dict(args.set))
+    except ValueError as exc:
+        sys.exit(str(exc))
+    print(f"Recomputed totals for {updated} supplier(s)")
+
+
+def cmd_compact(args):
+    from supplier_db import compact_suppliers
+
+    report = compact_suppliers(args.db)
+    if report["backup"]:
+        print(f"Saved a copy of the database before merging to {report['backup']}")
+    print(
+        f"Merged {report['removed']} duplicate supplier(s); "
+        f"{report['bytes_before'] / 1e6:.1f} MB -> {report['bytes_after'] / 1e6:.1f} MB"
+    )
+
+
+# --- PARSER ---
+def build_parser():
+    parser = argparse.ArgumentParser(prog="supplier_cli", description="Batch jobs for the supplier database.")
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"SQLite database (default: {DEFAULT_DB})")
+    parser.add_argument("--tenant", help="Team workspace whose database to use instead of --db")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rank = commands.add_parser("rank", help="Rank suppliers with AHP-weighted TOPSIS")
+    weighting = rank.add_mutually_exclusive_group()
+    weighting.add_argument("--weights", help="Criterion weights: cost,emissions,deforestation,recyclability")
+    weighting.add_argument("--pairwise", help="AHP upper-triangle comparisons, row by row (6 values)")
+    rank.add_argument("--top", type=int, help="Only output the first N suppliers")
+    rank.add_argument("--output", help="Write CSV here instead of stdout")
+    rank.add_argument("--stream", action="store_true",
+                      help="Score the table in chunks with bounded memory (requires --top)")
+    rank.add_argument("--float32", action="store_true", help="With --stream, score in single precision")
+    rank.set_defaults(func=cmd_rank)
+
+    load = commands.add_parser("import", help="Bulk import a supplier list (CSV or XLSX)")
+    load.add_argument("path", type=_supplier_file)
+    load.add_argument("--chunksize", type=int, default=5000)
+    load.add_argument("--estimate", choices=["auto", "air", "off"], default="auto",
+                      help="Route used to estimate rows without distances (default: road / sea by region)")
+    load.add_argument("--destination", default=DEFAULT_DESTINATION, help=DESTINATION_HELP)
+    load.set_defaults(func=cmd_import)
+
+    distances = commands.add_parser("distances", help="Estimate distances of stored suppliers that have none")
+    distances.add_argument("--mode", choices=["auto", "air"], default="auto",
+                           help="auto: road within a region, sea between regions; air: all by air")
+    distances.add_argument("--destination", default=DEFAULT_DESTINATION, help=DESTINATION_HELP)
+    distances.set_defaults(func=cmd_distances)
+
+    recompute = commands.add_parser("recompute", help="Recompute total cost and emissions in place")
+    recompute.add_argument("--set", action="append", default=[], type=_override, metavar="COLUMN=VALUE",
+                           help="Revise a factor column for all rows before recomputing")
+    recompute.set_defaults(func=cmd_recompute)
+
+    compact = commands.add_parser("compact", help="Merge duplicate suppliers and VACUUM the database")
+    compact.set_defaults(func=cmd_compact)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.tenant:
+        from supplier_tenants import tenant_db_path
+
+        args.db = tenant_db_path(args.tenant)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1294 @@
+# Shared SQLite storage for the supplier apps
+import atexit
+import itertools
+import queue
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import datetime
+
+SUPPLIER_COLUMNS = [
+    "id",
+    "name",
+    "location_city",
+    "location_country",
+    "quantity_units",
+    "price_per_unit",
+    "unit_weight_kg",
+    "distance_sea_km",
+    "distance_road_km",
+    "distance_air_km",
+    "delivery_cost_sea",
+    "delivery_cost_road",
+    "end_of_life_cost_per_kg",
+    "emission_factor_prod",
+    "emission_factor_sea",
+    "emission_factor_road",
+    "emission_factor_air",
+    "emission_factor_eol",
+    "deforestation_risk",
+    "reusable",
+    "reuse_count",
+    "return_km",
+    "recyclability",
+    "recycled_materials",
+    "total_cost",
+    "total_emissions",
+    "created_at",
+]
+
+# Compact encodings: ids are 16-byte uuid BLOBs, flags 0/1, risk 1 (Low) .. 3 (High)
+FLAG_COLUMNS = ["reusable", "recyclability", "recycled_materials"]
+RISK_LEVELS = {"Low": 1, "Medium": 2, "High": 3}
+RISK_NAMES = {level: name for name, level in RISK_LEVELS.items()}
+
+INSERT_SQL = f"INSERT INTO suppliers VALUES ({', '.join('?' for _ in SUPPLIER_COLUMNS)})"
+
+# A supplier is identified by name + city + country (case-insensitive). Saving
+# an existing one updates it in place, keeping its id and created_at.
+NATURAL_KEY = ["name", "location_city", "location_country"]
+_KEY_TARGET = ", ".join(f"{col} COLLATE NOCASE" for col in NATURAL_KEY)
+UPSERT_SQL = INSERT_SQL + f" ON CONFLICT ({_KEY_TARGET}) DO UPDATE SET " + ", ".join(
+    f"{col} = excluded.{col}" for col in SUPPLIER_COLUMNS[1:-1]
+)
+
+
+# --- CONNECTIONS ---
+PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA mmap_size=268435456",
+]
+
+
+_epochs = itertools.count(1)
+
+
+class ConnectionManager:
+    """Process-wide connections for one database file.
+
+    A single writer connection is serialized by a lock, while readers borrow
+    connections from a small pool. In WAL mode readers see the last committed
+    snapshot and never block the writer (or each other).
+    """
+
+    def __init__(self, db_path, max_readers=8):
+        self.db_path = db_path
+        self.max_readers = max_readers
+        self.write_lock = threading.RLock()
+        self._readers = queue.LifoQueue()
+        self._writer = self._connect()
+        self._probe_lock = threading.Lock()
+        self._probe = self._connect(read_only=True)
+        self.closed = False
+        # open_db blocks using this manager; guarded by _managers_lock
+        self.holders = 0
+        self.epoch = next(_epochs)
+
+    def _connect(self, read_only=False):
+        conn = sqlite3.connect(self.db_path, timeout=5.0, check_same_thread=False)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        if read_only:
+            conn.execute("PRAGMA query_only=1")
+        return conn
+
+    @contextmanager
+    def read(self):
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            conn = self._connect(read_only=True)
+        try:
+            yield conn
+        finally:
+            # a reader borrowed while the manager was evicted is closed on return
+            if not self.closed and self._readers.qsize() < self.max_readers:
+                self._readers.put(conn)
+            else:
+                conn.close()
+
+    @contextmanager
+    def write(self, durable=False):
+        """Yield the writer inside a transaction, committed on success.
+
+        With `durable` the commit is fsynced (synchronous=FULL) before returning.
+        """
+        with self.write_lock:
+            if durable:
+                self._writer.execute("PRAGMA synchronous=FULL")
+            try:
+                with self._writer:
+                    yield self._writer
+            finally:
+                if durable:
+                    self._writer.execute("PRAGMA synchronous=NORMAL")
+
+    def data_version(self):
+        """Changes whenever any connection (in this process or not) commits to the file.
+
+        PRAGMA data_version restarts when the file is reopened, so it is paired
+        with this manager's epoch: a version never repeats after an eviction.
+        """
+        with self._probe_lock:
+            return self.epoch, self._probe.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self):
+        """Close every idle connection; waits for a write in progress to commit."""
+        self.closed = True
+        with self.write_lock:
+            self._writer.close()
+        with self._probe_lock:
+            self._probe.close()
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
+
+
+# With one file per tenant (supplier_tenants) only the most recently used
+# databases keep their connections open; the least recently used one nobody
+# holds is closed.
+MAX_OPEN_DATABASES = 32
+
+_managers = OrderedDict()
+_managers_lock = threading.Lock()
+# db_path -> Future set once that file's manager is created and migrated
+_opening = {}
+_close_listeners = []
+
+
+@contextmanager
+def open_db(db_path):
+    """Hold the shared ConnectionManager for `db_path` for the duration of the block.
+
+    The schema is created on first use. A held manager is never closed by the
+    MAX_OPEN_DATABASES eviction, so use this whenever the manager is kept
+    across several operations (chunked writes, generators, version checks).
+    """
+    manager = _acquire(db_path)
+    try:
+        yield manager
+    finally:
+        _release(manager)
+
+
+def get_db(db_path):
+    """Create the schema if needed and return the shared ConnectionManager without holding it.
+
+    The manager may be closed as soon as other databases are opened (even
+    before this returns, if MAX_OPEN_DATABASES others are held), so run
+    statements inside open_db instead.
+    """
+    with open_db(db_path) as manager:
+        return manager
+
+
+def _acquire(db_path):
+    while True:
+        with _managers_lock:
+            manager = _managers.get(db_path)
+            if manager is not None:
+                _managers.move_to_end(db_path)
+                manager.holders += 1
+                evicted = _evict_idle()
+                break
+            opening = _opening.get(db_path)
+            if opening is None:
+                opening = _opening[db_path] = Future()
+                break
+        # another thread is opening (and maybe migrating) this file; wait, then retry
+        opening.result()
+    if manager is not None:
+        _close(evicted)
+        return manager
+
+    # migrations (VACUUM included) run outside _managers_lock so other files stay available
+    try:
+        manager = ConnectionManager(db_path)
+        try:
+            _create_schema(manager)
+        except BaseException:
+            manager.close()
+            raise
+    except BaseException as exc:
+        with _managers_lock:
+            del _opening[db_path]
+        opening.set_exception(exc)
+        raise
+    with _managers_lock:
+        del _opening[db_path]
+        _managers[db_path] = manager
+        manager.holders += 1
+        evicted = _evict_idle()
+    opening.set_result(manager)
+    _close(evicted)
+    return manager
+
+
+def _release(manager):
+    with _managers_lock:
+        manager.holders -= 1
+        evicted = _evict_idle()
+    _close(evicted)
+
+
+def _evict_idle():
+    """Pop least recently used managers nobody holds until at most MAX_OPEN_DATABASES remain.
+
+    Call with _managers_lock held. Held managers stay open (and shared) even
+    past the limit; they are evicted once released.
+    """
+    evicted = []
+    excess = len(_managers) - MAX_OPEN_DATABASES
+    for path in list(_managers):
+        if excess <= 0:
+            break
+        if _managers[path].holders == 0:
+            evicted.append((path, _managers.pop(path)))
+            excess -= 1
+    return evicted
+
+
+def _close(evicted):
+    # outside the lock: closing waits for any write in progress on that file
+    for path, manager in evicted:
+        manager.close()
+        _forget(path)
+
+
+def add_close_listener(listener):
+    """Register listener(db_path), called when a database is closed so per-file caches can be dropped."""
+    _close_listeners.append(listener)
+
+
+def _forget(db_path):
+    for key in list(_frame_cache):
+        if key[0] == db_path:
+            _frame_cache.pop(key, None)
+    for listener in _close_listeners:
+        listener(db_path)
+
+
+@atexit.register
+def close_all():
+    close_writers()
+    with _managers_lock:
+        managers = list(_managers.items())
+        _managers.clear()
+    _close(managers)
+
+
+# --- DB SETUP ---
+# Migrations are frozen once released: each spells out its own statements and
+# uses nothing else from this module, so a file migrates the same way whatever
+# version of the module runs it.
+def _migrate_1_initial(conn):
+    """Original layout: TEXT uuid ids, Yes/No and Low/Medium/High labels, deforestation_score."""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS suppliers (
+            id TEXT PRIMARY KEY,
+            name TEXT,
+            location_city TEXT,
+            location_country TEXT,
+            quantity_units REAL,
+            price_per_unit REAL,
+            unit_weight_kg REAL,
+            distance_sea_km REAL,
+            distance_road_km REAL,
+            distance_air_km REAL,
+            delivery_cost_sea REAL,
+            delivery_cost_road REAL,
+            end_of_life_cost_per_kg REAL,
+            emission_factor_prod REAL,
+            emission_factor_sea REAL,
+            emission_factor_road REAL,
+            emission_factor_air REAL,
+            emission_factor_eol REAL,
+            deforestation_risk TEXT,
+            deforestation_score INTEGER,
+            reusable TEXT,
+            reuse_count REAL,
+            return_km REAL,
+            recyclability TEXT,
+            recycled_materials TEXT,
+            total_cost REAL,
+            total_emissions REAL,
+            created_at TEXT
+        )
+    ''')
+    conn.execute("DROP INDEX IF EXISTS idx_suppliers_name")
+    # files from before the natural key may hold duplicates the unique index
+    # rejects; deleting them is left to compact_suppliers, which keeps a backup
+    duplicates = conn.execute("""
+        SELECT COUNT(*) - (SELECT COUNT(*) FROM (
+            SELECT 1 FROM suppliers
+            GROUP BY name COLLATE NOCASE, location_city COLLATE NOCASE, location_country COLLATE NOCASE
+        )) FROM suppliers
+    """).fetchone()[0]
+    if duplicates:
+        raise DuplicateSuppliersError(duplicates)
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_suppliers_natural_key ON suppliers "
+        "(name COLLATE NOCASE, location_city COLLATE NOCASE, location_country COLLATE NOCASE)"
+    )
+
+
+def _migrate_2_compact(conn):
+    """16-byte BLOB ids, 0/1 flags, risk as 1-3 integer; deforestation_score dropped."""
+    # not deterministic: ids that are not valid uuids get a fresh random one
+    conn.create_function("uuid_bytes", 1, _uuid_bytes)
+    conn.execute('''
+        CREATE TABLE suppliers_compact (
+            id BLOB PRIMARY KEY,
+            name TEXT,
+            location_city TEXT,
+            location_country TEXT,
+            quantity_units REAL,
+            price_per_unit REAL,
+            unit_weight_kg REAL,
+            distance_sea_km REAL,
+            distance_road_km REAL,
+            distance_air_km REAL,
+            delivery_cost_sea REAL,
+            delivery_cost_road REAL,
+            end_of_life_cost_per_kg REAL,
+            emission_factor_prod REAL,
+            emission_factor_sea REAL,
+            emission_factor_road REAL,
+            emission_factor_air REAL,
+            emission_factor_eol REAL,
+            deforestation_risk INTEGER,
+            reusable INTEGER,
+            reuse_count REAL,
+            return_km REAL,
+            recyclability INTEGER,
+            recycled_materials INTEGER,
+            total_cost REAL,
+            total_emissions REAL,
+            created_at TEXT
+        )
+    ''')
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(suppliers_compact)")]
+    converted = {column: column for column in columns}
+    converted["id"] = "uuid_bytes(id)"
+    converted["deforestation_risk"] = (
+        "CASE deforestation_risk WHEN 'Low' THEN 1 WHEN 'Medium' THEN 2 WHEN 'High' THEN 3 "
+        "ELSE deforestation_score END"
+    )
+    for column in ("reusable", "recyclability", "recycled_materials"):
+        converted[column] = f"({column} = 'Yes')"
+    conn.execute(
+        f"INSERT INTO suppliers_compact ({', '.join(columns)}) "
+        f"SELECT {', '.join(converted[column] for column in columns)} FROM suppliers ORDER BY rowid"
+    )
+    conn.execute("DROP TABLE suppliers")
+    conn.execute("ALTER TABLE suppliers_compact RENAME TO suppliers")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_suppliers_created_at ON suppliers (created_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_suppliers_country ON suppliers (location_country COLLATE NOCASE)")
+    # also serves name prefix search and name sorting
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_suppliers_natural_key ON suppliers "
+        "(name COLLATE NOCASE, location_city COLLATE NOCASE, location_country COLLATE NOCASE)"
+    )
+
+
+def _uuid_bytes(text):
+    try:
+        return uuid.UUID(text).bytes
+    except (TypeError, ValueError):
+        return new_id()
+
+
+def _migrate_3_shortlist_index(conn):
+    """Covers the decision-matrix columns: shortlist limits are answered from the index alone."""
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_suppliers_shortlist "
+        "ON suppliers (total_cost, total_emissions, deforestation_risk, recyclability, name)"
+    )
+
+
+def _migrate_4_pareto_frontier(conn):
+    """Side table of non-dominated suppliers, kept current by triggers.
+
+    An insert only needs the current frontier: a new row dominated by anyone
+    is dominated by a frontier member, and if it is not dominated it replaces
+    the members it dominates. Updates and deletes can bring dominated rows
+    back, so they mark the table stale and refresh_frontier rebuilds it once
+    on next use. Migrations that rebuild the suppliers table must recreate
+    these triggers.
+    """
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS supplier_frontier "
+        "(id BLOB PRIMARY KEY, cost REAL, emissions REAL, risk INTEGER) WITHOUT ROWID"
+    )
+    conn.execute("CREATE TABLE IF NOT EXISTS supplier_frontier_state (stale INTEGER NOT NULL)")
+    # built from the existing rows on first use (refresh_frontier)
+    conn.execute("INSERT INTO supplier_frontier_state VALUES (1)")
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS suppliers_frontier_insert AFTER INSERT ON suppliers
+        WHEN NOT (SELECT stale FROM supplier_frontier_state)
+        BEGIN
+            DELETE FROM supplier_frontier
+            WHERE cost >= IFNULL(NEW.total_cost, 0.0) AND emissions >= IFNULL(NEW.total_emissions, 0.0)
+              AND risk >= IFNULL(NEW.deforestation_risk, 3)
+              AND (cost > IFNULL(NEW.total_cost, 0.0) OR emissions > IFNULL(NEW.total_emissions, 0.0)
+                   OR risk > IFNULL(NEW.deforestation_risk, 3));
+            INSERT INTO supplier_frontier
+            SELECT NEW.id, IFNULL(NEW.total_cost, 0.0), IFNULL(NEW.total_emissions, 0.0),
+                   IFNULL(NEW.deforestation_risk, 3)
+            WHERE NOT EXISTS (
+                SELECT 1 FROM supplier_frontier
+                WHERE cost <= IFNULL(NEW.total_cost, 0.0) AND emissions <= IFNULL(NEW.total_emissions, 0.0)
+                  AND risk <= IFNULL(NEW.deforestation_risk, 3)
+                  AND (cost < IFNULL(NEW.total_cost, 0.0) OR emissions < IFNULL(NEW.total_emissions, 0.0)
+                       OR risk < IFNULL(NEW.deforestation_risk, 3))
+            );
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS suppliers_frontier_update
+        AFTER UPDATE OF total_cost, total_emissions, deforestation_risk ON suppliers
+        WHEN OLD.total_cost IS NOT NEW.total_cost OR OLD.total_emissions IS NOT NEW.total_emissions
+          OR OLD.deforestation_risk IS NOT NEW.deforestation_risk
+        BEGIN
+            UPDATE supplier_frontier_state SET stale = 1;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS suppliers_frontier_delete AFTER DELETE ON suppliers
+        WHEN EXISTS (SELECT 1 FROM supplier_frontier WHERE id = OLD.id)
+        BEGIN
+            UPDATE supplier_frontier_state SET stale = 1;
+        END
+    """)
+
+
+def _migrate_5_rollups(conn):
+    """Per day / month x country x risk summaries, kept current by triggers.
+
+    Missing values group under '' (country / period) and 0 (risk).
+    """
+    grains = [("supplier_rollup_daily", 10), ("supplier_rollup_monthly", 7)]
+    # adds the NEW / OLD row to its group, or with sign "-" subtracts it
+    apply = """
+            INSERT INTO {table} VALUES (
+                IFNULL(substr({row}.created_at, 1, {width}), ''), IFNULL({row}.location_country, ''),
+                IFNULL({row}.deforestation_risk, 0), {sign}1, {sign}IFNULL({row}.total_cost, 0.0),
+                {sign}IFNULL({row}.total_emissions, 0.0), {sign}(IFNULL({row}.recyclability, 0) <> 0)
+            )
+            ON CONFLICT DO UPDATE SET suppliers = suppliers + excluded.suppliers,
+                total_cost = total_cost + excluded.total_cost,
+                total_emissions = total_emissions + excluded.total_emissions,
+                recyclable = recyclable + excluded.recyclable;"""
+    drop_empty = """
+            DELETE FROM {table} WHERE period = IFNULL(substr(OLD.created_at, 1, {width}), '')
+                AND location_country = IFNULL(OLD.location_country, '')
+                AND deforestation_risk = IFNULL(OLD.deforestation_risk, 0) AND suppliers = 0;"""
+    add = "".join(apply.format(table=table, width=width, row="NEW", sign="") for table, width in grains)
+    remove = "".join(
+        apply.format(table=table, width=width, row="OLD", sign="-") + drop_empty.format(table=table, width=width)
+        for table, width in grains
+    )
+    for table, width in grains:
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                period TEXT NOT NULL,
+                location_country TEXT NOT NULL,
+                deforestation_risk INTEGER NOT NULL,
+                suppliers INTEGER NOT NULL,
+                total_cost REAL NOT NULL,
+                total_emissions REAL NOT NULL,
+                recyclable INTEGER NOT NULL,
+                PRIMARY KEY (period, location_country, deforestation_risk)
+            ) WITHOUT ROWID
+        """)
+        conn.execute(f"""
+            INSERT INTO {table}
+            SELECT IFNULL(substr(created_at, 1, {width}), ''), IFNULL(location_country, ''),
+                   IFNULL(deforestation_risk, 0), COUNT(*), SUM(IFNULL(total_cost, 0.0)),
+                   SUM(IFNULL(total_emissions, 0.0)), SUM(IFNULL(recyclability, 0) <> 0)
+            FROM suppliers GROUP BY 1, 2, 3
+        """)
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS suppliers_rollup_insert AFTER INSERT ON suppliers BEGIN{add}\n        END")
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS suppliers_rollup_delete AFTER DELETE ON suppliers BEGIN{remove}\n        END")
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS suppliers_rollup_update
+        AFTER UPDATE OF created_at, location_country, deforestation_risk, total_cost, total_emissions, recyclability
+        ON suppliers
+        WHEN OLD.created_at IS NOT NEW.created_at OR OLD.location_country IS NOT NEW.location_country
+          OR OLD.deforestation_risk IS NOT NEW.deforestation_risk OR OLD.total_cost IS NOT NEW.total_cost
+          OR OLD.total_emissions IS NOT NEW.total_emissions OR OLD.recyclability IS NOT NEW.recyclability
+        BEGIN{remove}{add}
+        END
+    """)
+
+
+def _migrate_6_geo_cache(conn):
+    """Great-circle km per (destination, origin), filled on demand by supplier_geo."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS geo_distance_cache (
+            destination TEXT NOT NULL,
+            origin_city TEXT NOT NULL,
+            origin_country TEXT NOT NULL,
+            great_circle_km REAL NOT NULL,
+            same_region INTEGER NOT NULL,
+            PRIMARY KEY (destination, origin_city, origin_country)
+        ) WITHOUT ROWID
+    """)
+
+
+def _migrate_7_fold_geo_cache(conn):
+    """The geo cache is now keyed on folded city / country; drop rows keyed on raw spellings."""
+    conn.execute("DELETE FROM geo_distance_cache")
+
+
+# (schema version, migration); PRAGMA user_version records the last one applied
+MIGRATIONS = [
+    (1, _migrate_1_initial),
+    (2, _migrate_2_compact),
+    (3, _migrate_3_shortlist_index),
+    (4, _migrate_4_pareto_frontier),
+    (5, _migrate_5_rollups),
+    (6, _migrate_6_geo_cache),
+    (7, _migrate_7_fold_geo_cache),
+]
+# migrations that rewrite the table leave free pages behind
+_RECLAIM_AFTER = {2}
+
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def _create_schema(manager):
+    """Bring the file up to the latest schema, one migration per transaction.
+
+    BEGIN IMMEDIATE takes the write lock before the version is re-read, so two
+    processes opening an old file at once do not both migrate it.
+    """
+    with manager.write_lock:
+        conn = manager._writer
+        reclaim = False
+        for version, migration in MIGRATIONS:
+            if schema_version(conn) >= version:
+                continue
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if schema_version(conn) < version:
+                    migration(conn)
+                    conn.execute(f"PRAGMA user_version = {version}")
+                    reclaim |= version in _RECLAIM_AFTER
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        if reclaim:
+            conn.execute("VACUUM")
+
+
+class DuplicateSuppliersError(ValueError):
+    """The file predates the natural key and holds duplicates; compact_suppliers merges them."""
+
+    def __init__(self, duplicates):
+        super().__init__(
+            f"{duplicates} supplier(s) share a name, city and country with another one. "
+            "Run 'python supplier_cli.py compact' to merge them (a backup of the file is kept)."
+        )
+        self.duplicates = duplicates
+
+
+def count_duplicates(conn):
+    """Rows merge_duplicates would remove."""
+    return conn.execute(f"""
+        SELECT COUNT(*) - (SELECT COUNT(*) FROM (SELECT 1 FROM suppliers GROUP BY {_KEY_TARGET}))
+        FROM suppliers
+    """).fetchone()[0]
+
+
+def merge_duplicates(conn):
+    """Keep only the most recently entered row per natural key; returns rows removed.
+
+    The caller owns the transaction.
+    """
+    return conn.execute(f"""
+        DELETE FROM suppliers WHERE rowid NOT IN (
+            SELECT rowid FROM (
+                SELECT rowid, ROW_NUMBER() OVER (
+                    PARTITION BY {_KEY_TARGET} ORDER BY created_at DESC, rowid DESC
+                ) AS newest
+                FROM suppliers
+            ) WHERE newest = 1
+        )
+    """).rowcount
+
+
+def compact_suppliers(db_path):
+    """Merge duplicate suppliers, then VACUUM and truncate the WAL to reclaim space.
+
+    A database created before the natural key cannot be opened while it holds
+    duplicates; they are merged here first, on a plain connection, after the
+    file is copied to `<db_path>.<timestamp>.bak`. The rollup tables are
+    rebuilt from scratch as well.
+
+    Returns {"removed", "backup", "bytes_before", "bytes_after"} (main file
+    plus WAL); "backup" is None when nothing had to be merged.
+    """
+    import os
+
+    def size():
+        return sum(os.path.getsize(p) for p in (db_path, db_path + "-wal") if os.path.exists(p))
+
+    bytes_before = size()
+    removed, backup = _merge_with_backup(db_path) if os.path.exists(db_path) else (0, None)
+    with open_db(db_path) as db:
+        with db.write() as conn:
+            # also drops the rounding that incremental sums accumulate over time
+            rebuild_rollups(conn)
+        with db.write_lock:
+            db._writer.execute("VACUUM")
+            db._writer.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    return {"removed": removed, "backup": backup, "bytes_before": bytes_before, "bytes_after": size()}
+
+
+def _merge_with_backup(db_path):
+    conn = sqlite3.connect(db_path, timeout=5.0, isolation_level=None)
+    try:
+        has_table = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'suppliers'"
+        ).fetchone()
+        if not has_table or not count_duplicates(conn):
+            return 0, None
+        # the app refuses to open such a file, so nothing writes between the copy and the merge
+        backup = f"{db_path}.{datetime.utcnow():%Y%m%dT%H%M%S}.bak"
+        target = sqlite3.connect(backup)
+        try:
+            conn.backup(target)
+        finally:
+            target.close()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            removed = merge_duplicates(conn)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return removed, backup
+    finally:
+        conn.close()
+
+
+def init_db(db_path):
+    """Idempotent and cheap after the first call in a process."""
+    get_db(db_path)
+
+
+# --- WRITES ---
+def new_id():
+    return uuid.uuid4().bytes
+
+
+def supplier_row(data, created_at=None):
+    """Build the INSERT parameters for one supplier dict, assigning a fresh id."""
+    return (new_id(),) + tuple(data[col] for col in SUPPLIER_COLUMNS[1:-1]) + (
+        created_at or datetime.utcnow().isoformat(),
+    )
+
+
+def insert_suppliers(conn, rows):
+    """Upsert many prepared rows with one executemany; the caller owns the transaction."""
+    conn.executemany(UPSERT_SQL, rows)
+
+
+def upsert_supplier(conn, row):
+    """Upsert one prepared row; returns (id, inserted). The caller owns the transaction."""
+    supplier_id = conn.execute(UPSERT_SQL + " RETURNING id", row).fetchone()[0]
+    return supplier_id, supplier_id == row[0]
+
+
+_insert_listeners = []
+
+
+def add_insert_listener(listener):
+    """Register listener(db_path, data, version_before, version_after), called after each save_supplier."""
+    _insert_listeners.append(listener)
+
+
+def _notify_inserted(db_path, saved, version_before, version_after):
+    # rows committed together: the first moves the version, later ones see it unchanged.
+    # Listeners only hear about pure inserts; after an update they see a data_version
+    # they did not expect and rebuild.
+    for i, data in enumerate(saved):
+        for listener in _insert_listeners:
+            listener(db_path, data, version_before if i == 0 else version_after, version_after)
+
+
+def save_supplier(data, db_path):
+    """Upsert one supplier synchronously (scripts, CLI); returns (id, inserted).
+
+    The apps use submit_supplier instead.
+    """
+    with open_db(db_path) as db, db.write_lock:
+        version_before = db.data_version()
+        with db.write() as conn:
+            supplier_id, inserted = upsert_supplier(conn, supplier_row(data))
+        version_after = db.data_version()
+    if inserted:
+        _notify_inserted(db_path, [data], version_before, version_after)
+    return supplier_id, inserted
+
+
+# --- BACKGROUND WRITER ---
+# Submissions arriving within GROUP_COMMIT_WAIT of each other share one transaction
+GROUP_COMMIT_MAX = 256
+GROUP_COMMIT_WAIT = 0.01
+# A writer thread with nothing to do for this long exits; the next submit starts a new one
+WRITER_IDLE_SECONDS = 60
+WRITE_RETRIES = 6
+RETRY_BASE_DELAY = 0.05
+_STOP = object()
+
+
+class WriteQueue:
+    """Background thread that group-commits submitted suppliers for one database.
+
+    Sessions enqueue rows and wait on a Future instead of holding the write
+    lock themselves. The thread drains whatever is pending into a single
+    transaction committed with synchronous=FULL, so one fsync covers the whole
+    group and a resolved Future means the row is durable. "database is locked"
+    errors (another process writing) are retried with exponential backoff.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._queue = queue.Queue()
+        # the batch being written, failed by _run if the thread dies mid-batch
+        self._in_flight = []
+        self._thread = threading.Thread(target=self._run, name=f"supplier-writer:{db_path}", daemon=True)
+        self._thread.start()
+
+    def submit(self, data):
+        """Queue one supplier dict; the Future resolves to (id, inserted) once committed."""
+        future = Future()
+        self._queue.put((data, future))
+        return future
+
+    def close(self, timeout=None):
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _next_batch(self):
+        try:
+            batch = [self._queue.get(timeout=WRITER_IDLE_SECONDS)]
+        except queue.Empty:
+            return None
+        deadline = time.monotonic() + GROUP_COMMIT_WAIT
+        while batch[-1] is not _STOP and len(batch) < GROUP_COMMIT_MAX:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _commit(self, rows):
+        for attempt in range(WRITE_RETRIES + 1):
+            try:
+                with open_db(self.db_path) as db, db.write_lock:
+                    version_before = db.data_version()
+                    with db.write(durable=True) as conn:
+                        results = [upsert_supplier(conn, row) for row in rows]
+                    return results, version_before, db.data_version()
+            except sqlite3.OperationalError as exc:
+                contended = "locked" in str(exc) or "busy" in str(exc)
+                if not contended or attempt == WRITE_RETRIES:
+                    raise
+                time.sleep(RETRY_BASE_DELAY * 2 ** attempt * random.uniform(0.5, 1.5))
+
+    def _run(self):
+        try:
+            self._serve()
+        finally:
+            # an unexpected error must not leave a dead writer registered: later
+            # submissions get a new one, and anything already queued here fails
+            with _writers_lock:
+                if _writers.get(self.db_path) is self:
+                    del _writers[self.db_path]
+            for _, future in self._in_flight:
+                _fail(future, "The supplier could not be saved")
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    _fail(item[1], "The supplier writer stopped; please resubmit")
+
+    def _serve(self):
+        stopping = False
+        while not stopping:
+            batch = self._next_batch()
+            if batch is None:
+                # submissions are queued under _writers_lock, so none can slip in after this check
+                with _writers_lock:
+                    if self._queue.empty():
+                        if _writers.get(self.db_path) is self:
+                            del _writers[self.db_path]
+                        return
+                continue
+            stopping = batch[-1] is _STOP
+            self._in_flight = [item for item in batch if item is not _STOP]
+            prepared = []
+            for data, future in self._in_flight:
+                try:
+                    prepared.append((data, future, supplier_row(data)))
+                except Exception as exc:
+                    future.set_exception(exc)
+            if prepared:
+                self._write(prepared)
+            self._in_flight = []
+
+    def _write(self, prepared):
+        """Commit (data, future, row) items in one transaction and resolve their futures.
+
+        A group that fails for any reason other than contention is retried row
+        by row, so only the submission SQLite rejects fails.
+        """
+        try:
+            results, *versions = self._commit([row for _, _, row in prepared])
+        except Exception as exc:
+            if len(prepared) > 1 and not isinstance(exc, sqlite3.OperationalError):
+                for item in prepared:
+                    self._write([item])
+                return
+            for _, future, _ in prepared:
+                future.set_exception(exc)
+            return
+        # listeners first, so a session woken by its Future sees up-to-date caches
+        try:
+            if all(inserted for _, inserted in results):
+                _notify_inserted(self.db_path, [data for data, _, _ in prepared], *versions)
+        except Exception:
+            # a failing listener must not stop the writer; caches rebuild from data_version
+            pass
+        for result, (_, future, _) in zip(results, prepared):
+            future.set_result(result)
+
+
+def _fail(future, message):
+    if not future.done():
+        future.set_exception(RuntimeError(message))
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def submit_supplier(data, db_path):
+    """Queue a supplier for the background writer; returns a Future of (id, inserted)."""
+    with _writers_lock:
+        writer = _writers.get(db_path)
+        if writer is None:
+            writer = _writers[db_path] = WriteQueue(db_path)
+        return writer.submit(data)
+
+
+def close_writers():
+    """Commit everything still queued and stop the writer threads (runs at exit)."""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
+
+
+# --- CACHED READS ---
+SUPPLIERS_SQL = "SELECT * FROM suppliers ORDER BY created_at DESC"
+
+_frame_cache = {}
+
+
+def suppliers_snapshot(db_path, sql=SUPPLIERS_SQL):
+    """(DataFrame, data_version it was loaded at), reloading only after a write to the database.
+
+    The cached frame is shared between reruns and sessions: treat it as
+    read-only and .copy() before adding columns.
+    """
+    import pandas as pd
+
+    with open_db(db_path) as db:
+        version = db.data_version()
+        cached = _frame_cache.get((db_path, sql))
+        if cached is not None and cached[0] == version:
+            return cached[1], version
+        with db.read() as conn:
+            df = pd.read_sql_query(sql, conn)
+    _frame_cache[(db_path, sql)] = (version, df)
+    return df, version
+
+
+def load_suppliers(db_path, sql=SUPPLIERS_SQL):
+    """Cached suppliers DataFrame; see suppliers_snapshot."""
+    return suppliers_snapshot(db_path, sql)[0]
+
+
+# --- DECISION MATRIX ---
+# TOPSIS criteria (supplier_scoring.CRITERIA order): deforestation is flipped so
+# that Low risk scores 3; recyclability is stored as 1/0 already.
+CRITERIA_SQL = [
+    "IFNULL(total_cost, 0.0)",
+    "IFNULL(total_emissions, 0.0)",
+    "4.0 - IFNULL(deforestation_risk, 3)",
+    "IFNULL(recyclability, 0)",
+]
+
+
+def _decision_sql(where="", key=None, ordered=True):
+    if key is None:
+        order = " ORDER BY rowid" if ordered else ""
+        return f"SELECT name, {', '.join(CRITERIA_SQL)} FROM suppliers{where}{order}"
+    return f"SELECT {key}, name, {', '.join(CRITERIA_SQL)} FROM suppliers{where} ORDER BY {key}, rowid"
+
+
+def fetch_decision_matrix(conn, where="", params=(), ordered=True):
+    """(names, contiguous float64 n x 4 matrix) selecting only the criteria columns.
+
+    Values stream from the cursor into np.fromiter; no DataFrame or per-row
+    Python encoding is involved. Rows are in insertion order unless `ordered`
+    is False, which lets SQLite answer from a covering index.
+    """
+    import numpy as np
+
+    cursor = conn.execute(_decision_sql(where, ordered=ordered), params)
+    names = []
+
+    def values():
+        for row in cursor:
+            names.append(row[0])
+            yield from row[1:]
+
+    matrix = np.fromiter(values(), dtype=np.float64).reshape(-1, len(CRITERIA_SQL))
+    return names, matrix
+
+
+def load_decision_matrix(db_path, where="", params=(), ordered=True):
+    with open_db(db_path) as db, db.read() as conn:
+        return fetch_decision_matrix(conn, where, params, ordered)
+
+
+# --- SHORTLIST CONSTRAINTS ---
+def constraint_predicates(constraints):
+    """[(description, SQL predicate, params)] for the hard limits set in `constraints`.
+
+    Recognised keys: max_cost, max_emissions, max_risk ("Low" / "Medium" /
+    "High"), recyclable_only, reusable_only, frontier_only (call
+    refresh_frontier first). Unset (None / False) keys add nothing.
+    """
+    predicates = []
+    if constraints.get("max_cost") is not None:
+        predicates.append((f"total cost ≤ {constraints['max_cost']:,.2f}", "total_cost <= ?",
+                           [constraints["max_cost"]]))
+    if constraints.get("max_emissions") is not None:
+        predicates.append((f"total emissions ≤ {constraints['max_emissions']:,.2f}", "total_emissions <= ?",
+                           [constraints["max_emissions"]]))
+    if constraints.get("max_risk"):
+        predicates.append((f"deforestation risk ≤ {constraints['max_risk']}", "deforestation_risk <= ?",
+                           [RISK_LEVELS[constraints["max_risk"]]]))
+    if constraints.get("recyclable_only"):
+        predicates.append(("recyclable", "recyclability = 1", []))
+    if constraints.get("reusable_only"):
+        predicates.append(("reusable", "reusable = 1", []))
+    if constraints.get("frontier_only"):
+        predicates.append(("on the Pareto frontier", "id IN (SELECT id FROM supplier_frontier)", []))
+    return predicates
+
+
+def constraint_clause(constraints):
+    """(" WHERE ...", params) joining every predicate, or ("", []) without limits."""
+    predicates = constraint_predicates(constraints)
+    if not predicates:
+        return "", []
+    return " WHERE " + " AND ".join(sql for _, sql, _ in predicates), [p for _, _, ps in predicates for p in ps]
+
+
+def explain_empty_shortlist(db_path, constraints):
+    """Why no supplier passes: per limit, how many pass it alone and how many pass all the others.
+
+    One scan returns every count. A limit whose "without" count is non-zero
+    is what empties the shortlist on its own.
+    """
+    predicates = constraint_predicates(constraints)
+    if not predicates:
+        return []
+    if constraints.get("frontier_only"):
+        refresh_frontier(db_path)
+    columns, params = [], []
+    for _, sql, ps in predicates:
+        columns.append(f"SUM({sql})")
+        params.extend(ps)
+    for i in range(len(predicates)):
+        others = [p for j, p in enumerate(predicates) if j != i]
+        columns.append(f"SUM({' AND '.join(sql for _, sql, _ in others) or '1'})")
+        params.extend(p for _, _, ps in others for p in ps)
+    with open_db(db_path) as db, db.read() as conn:
+        counts = conn.execute(f"SELECT {', '.join(columns)} FROM suppliers", params).fetchone()
+    n = len(predicates)
+    return [
+        {"constraint": description, "passing": counts[i] or 0, "passing_without": counts[n + i] or 0}
+        for i, (description, _, _) in enumerate(predicates)
+    ]
+
+
+def load_segmented_matrix(db_path, column, where="", params=()):
+    """(keys, names, matrix) like load_decision_matrix, sorted by `column` so segments are contiguous."""
+    import numpy as np
+
+    if column not in SUPPLIER_COLUMNS:
+        raise ValueError(f"Unknown supplier column: {column}")
+    keys, names = [], []
+    with open_db(db_path) as db, db.read() as conn:
+        cursor = conn.execute(_decision_sql(where, key=column), params)
+
+        def values():
+            for row in cursor:
+                keys.append(row[0])
+                names.append(row[1])
+                yield from row[2:]
+
+        matrix = np.fromiter(values(), dtype=np.float64).reshape(-1, len(CRITERIA_SQL))
+    return keys, names, matrix
+
+
+def iter_decision_chunks(conn, chunk_rows=50_000, dtype="float64", where="", params=()):
+    """Yield (names, matrix) blocks of at most `chunk_rows` rows via cursor.fetchmany."""
+    import numpy as np
+
+    cursor = conn.execute(_decision_sql(where), params)
+    while True:
+        rows = cursor.fetchmany(chunk_rows)
+        if not rows:
+            return
+        names = [row[0] for row in rows]
+        matrix = np.array([row[1:] for row in rows], dtype=dtype)
+        del rows
+        yield names, matrix
+
+
+# --- PARETO FRONTIER ---
+# Suppliers no other supplier beats on cost, emissions and deforestation risk at
+# once (all minimized, same NULL handling as CRITERIA_SQL). supplier_frontier is
+# kept current by the triggers _migrate_4_pareto_frontier creates.
+FRONTIER_SQL = ["IFNULL(total_cost, 0.0)", "IFNULL(total_emissions, 0.0)", "IFNULL(deforestation_risk, 3)"]
+
+
+def pareto_mask(points):
+    """Boolean mask of the non-dominated rows of an n x 3 (cost, emissions, risk) array.
+
+    All three are minimized. Risk has only a few levels, so each level is a 2D
+    problem: sorted by cost, a row is dominated when a prefix minimum of
+    emissions reaches it, either within its level or on the staircase of
+    lower levels' survivors. O(n log n) overall.
+    """
+    import numpy as np
+
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    mask = np.zeros(len(points), dtype=bool)
+    stair_cost, stair_emissions = np.empty(0), np.empty(0)
+    for level in np.unique(points[:, 2]):
+        rows = np.flatnonzero(points[:, 2] == level)
+        # work in cost order so every searchsorted query is itself sorted
+        rows = rows[np.argsort(points[rows, 0])]
+        cost, emissions = points[rows, 0], points[rows, 1]
+        prefix_min = np.minimum.accumulate(emissions)
+        # same level: strictly cheaper and no dirtier, or no dearer and strictly cleaner
+        cheaper = np.searchsorted(cost, cost, "left")
+        no_dearer = np.searchsorted(cost, cost, "right")
+        dominated = (cheaper > 0) & (prefix_min[np.maximum(cheaper - 1, 0)] <= emissions)
+        dominated |= prefix_min[no_dearer - 1] < emissions
+        # lower risk level: no dearer and no dirtier is enough
+        if len(stair_cost):
+            below = np.searchsorted(stair_cost, cost, "right")
+            dominated |= (below > 0) & (stair_emissions[np.maximum(below - 1, 0)] <= emissions)
+        mask[rows] = ~dominated
+
+        merged_cost = np.concatenate([stair_cost, cost[~dominated]])
+        merged_emissions = np.concatenate([stair_emissions, emissions[~dominated]])
+        order = np.argsort(merged_cost)
+        merged_cost, merged_emissions = merged_cost[order], merged_emissions[order]
+        keep = merged_emissions < np.concatenate([[np.inf], np.minimum.accumulate(merged_emissions)[:-1]])
+        stair_cost, stair_emissions = merged_cost[keep], merged_emissions[keep]
+    return mask
+
+
+def refresh_frontier(db_path):
+    """Rebuild supplier_frontier with pareto_mask if an update or delete left it stale.
+
+    Each write moves data_version and so invalidates every cache keyed on it.
+    When the rebuilt frontier equals the stored one only the stale flag is
+    cleared, so inserts are maintained incrementally by the trigger again.
+    """
+    import numpy as np
+
+    with open_db(db_path) as db:
+        with db.read() as conn:
+            if not conn.execute("SELECT stale FROM supplier_frontier_state").fetchone()[0]:
+                return
+        with db.write() as conn:
+            if not conn.execute("SELECT stale FROM supplier_frontier_state").fetchone()[0]:
+                return
+            ids = []
+
+            def values():
+                for row in conn.execute(f"SELECT id, {', '.join(FRONTIER_SQL)} FROM suppliers"):
+                    ids.append(row[0])
+                    yield from row[1:]
+
+            points = np.fromiter(values(), dtype=np.float64).reshape(-1, len(FRONTIER_SQL))
+            frontier = {(ids[i], points[i, 0], points[i, 1], int(points[i, 2]))
+                        for i in np.flatnonzero(pareto_mask(points))}
+            if frontier != set(conn.execute("SELECT id, cost, emissions, risk FROM supplier_frontier")):
+                conn.execute("DELETE FROM supplier_frontier")
+                conn.executemany("INSERT INTO supplier_frontier VALUES (?, ?, ?, ?)", frontier)
+            conn.execute("UPDATE supplier_frontier_state SET stale = 0")
+
+
+def frontier_ids(db_path):
+    """Set of supplier ids on the Pareto frontier (refreshed first if stale)."""
+    refresh_frontier(db_path)
+    with open_db(db_path) as db, db.read() as conn:
+        return {row[0] for row in conn.execute("SELECT id FROM supplier_frontier")}
+
+
+# --- ROLLUPS ---
+# Summary rows per (period, country, risk) so dashboards never scan suppliers,
+# kept current by the triggers _migrate_5_rollups creates. Missing values group
+# under '' (country / period) and 0 (risk).
+ROLLUP_TABLES = {"day": "supplier_rollup_daily", "month": "supplier_rollup_monthly"}
+_PERIOD_WIDTH = {"day": 10, "month": 7}
+
+
+def _rollup_key(grain, row):
+    return (
+        f"IFNULL(substr({row}created_at, 1, {_PERIOD_WIDTH[grain]}), '')",
+        f"IFNULL({row}location_country, '')",
+        f"IFNULL({row}deforestation_risk, 0)",
+    )
+
+
+def _rollup_measures(row):
+    return (
+        f"IFNULL({row}total_cost, 0.0)",
+        f"IFNULL({row}total_emissions, 0.0)",
+        f"(IFNULL({row}recyclability, 0) <> 0)",
+    )
+
+
+def rebuild_rollups(conn):
+    """Recompute every rollup table from suppliers; the caller owns the transaction."""
+    for grain, table in ROLLUP_TABLES.items():
+        key = ", ".join(_rollup_key(grain, ""))
+        conn.execute(f"DELETE FROM {table}")
+        conn.execute(
+            f"INSERT INTO {table} SELECT {key}, COUNT(*), "
+            f"{', '.join(f'SUM({value})' for value in _rollup_measures(''))} "
+            f"FROM suppliers GROUP BY 1, 2, 3"
+        )
+
+
+def load_rollup(db_path, grain="month"):
+    """Cached rollup DataFrame for `grain` ("day" or "month"), sorted by period.
+
+    Its size follows the number of periods x countries x risk levels, not the
+    number of suppliers. Treat it as read-only, like load_suppliers.
+    """
+    return load_suppliers(db_path, f"SELECT * FROM {ROLLUP_TABLES[grain]} ORDER BY period")
+
+
+# --- PAGINATED READS ---
+GRID_COLUMNS = [
+    "name",
+    "location_city",
+    "location_country",
+    "total_cost",
+    "total_emissions",
+    "deforestation_risk",
+    "recyclability",
+    "reusable",
+    "created_at",
+]
+SORTABLE_COLUMNS = ["created_at", "name", "location_country", "total_cost", "total_emissions"]
+
+
+def _escape_like(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _where_clause(filters):
+    clauses, params = [], []
+    if filters.get("name"):
+        clauses.append("name LIKE ? ESCAPE '\\'")
+        params.append(_escape_like(filters["name"]) + "%")
+    if filters.get("city"):
+        clauses.append("location_city LIKE ? ESCAPE '\\'")
+        params.append(_escape_like(filters["city"]) + "%")
+    if filters.get("country"):
+        clauses.append("location_country = ? COLLATE NOCASE")
+        params.append(filters["country"])
+    if filters.get("risks"):
+        clauses.append(f"deforestation_risk IN ({', '.join('?' for _ in filters['risks'])})")
+        params.extend(RISK_LEVELS[risk] for risk in filters["risks"])
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def count_suppliers(db_path, filters=None):
+    where, params = _where_clause(filters or {})
+    with open_db(db_path) as db, db.read() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM suppliers{where}", params).fetchone()[0]
+
+
+def query_suppliers_page(db_path, filters=None, sort_by="created_at", descending=True,
+                         page=1, page_size=50, columns=None):
+    """Return one page of suppliers with filtering, sorting and paging done in SQL.
+
+    `filters` may hold name / city prefixes, an exact country and a list of
+    risk labels. Name and country filters and the sort columns use indexes.
+    Values come back in their stored encoding; see decode_for_display.
+    """
+    import pandas as pd
+
+    if sort_by not in SORTABLE_COLUMNS:
+        raise ValueError(f"Cannot sort by {sort_by!r}")
+    columns = columns or GRID_COLUMNS
+    unknown = set(columns) - set(SUPPLIER_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown column(s): {', '.join(sorted(unknown))}")
+
+    where, params = _where_clause(filters or {})
+    direction = "DESC" if descending else "ASC"
+    collate = " COLLATE NOCASE" if sort_by in ("name", "location_country") else ""
+    offset = max(page - 1, 0) * page_size
+    with open_db(db_path) as db, db.read() as conn:
+        return pd.read_sql_query(
+            f"SELECT {', '.join(columns)} FROM suppliers{where} "
+            f"ORDER BY {sort_by}{collate} {direction}, rowid {direction} LIMIT ? OFFSET ?",
+            conn, params=params + [page_size, offset],
+        )
+
+
+def decode_for_display(df):
+    """Copy of a suppliers frame with readable ids, Yes/No flags and risk labels."""
+    df = df.copy()
+    if "id" in df:
+        df["id"] = [str(uuid.UUID(bytes=value)) if isinstance(value, bytes) else value for value in df["id"]]
+    for column in FLAG_COLUMNS:
+        if column in df:
+            df[column] = df[column].map({1: "Yes", 0: "No"})
+    if "deforestation_risk" in df:
+        df["deforestation_risk"] = df["deforestation_risk"].map(RISK_NAMES)
+    return df
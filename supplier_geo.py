@@ -0,0 +1,232 @@
+# Offline transport distance estimates from a supplier's city / country to the destination
+import csv
+import os
+import unicodedata
+
+import numpy as np
+
+from supplier_calc import totals_sql
+from supplier_db import open_db
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "gazetteer.csv")
+# Where goods are delivered: "City, Country" or just "Country", as listed in the gazetteer
+DESTINATION = os.environ.get("SUPPLIER_DESTINATION", "Rotterdam, Netherlands")
+EARTH_RADIUS_KM = 6371.0088
+# Route length over the great-circle distance, per transport mode
+DETOUR_FACTORS = {"road": 1.3, "sea": 1.35, "air": 1.05}
+
+# How an estimated leg is split over the distance columns: (detour mode, applies when).
+# "auto" goes by road when origin and destination share a gazetteer region (a
+# landmass; island nations have their own) and by sea otherwise.
+ROUTES = {
+    "auto": {"distance_road_km": ("road", "same_region"), "distance_sea_km": ("sea", "other_region")},
+    "air": {"distance_air_km": ("air", None)},
+}
+DISTANCE_COLUMNS = ["distance_sea_km", "distance_road_km", "distance_air_km"]
+
+# Folded spellings people type for countries, mapped to the gazetteer name
+COUNTRY_ALIASES = {
+    "usa": "united states", "us": "united states", "united states of america": "united states",
+    "uk": "united kingdom", "great britain": "united kingdom", "england": "united kingdom",
+    "scotland": "united kingdom", "wales": "united kingdom",
+    "czechia": "czech republic", "holland": "netherlands", "the netherlands": "netherlands",
+    "korea": "south korea", "republic of korea": "south korea", "turkiye": "turkey",
+    "uae": "united arab emirates", "ivory coast": "cote d'ivoire", "viet nam": "vietnam", "prc": "china",
+    "deutschland": "germany", "espana": "spain", "italia": "italy", "brasil": "brazil",
+}
+
+
+# --- GAZETTEER ---
+_gazetteer = None
+
+
+def _fold(text):
+    """Case-, accent- and whitespace-insensitive lookup key."""
+    text = unicodedata.normalize("NFKD", str(text or ""))
+    return " ".join("".join(c for c in text if not unicodedata.combining(c)).casefold().split())
+
+
+def _fold_country(country):
+    country = _fold(country)
+    return COUNTRY_ALIASES.get(country, country)
+
+
+def load_gazetteer():
+    """{(city, country): (lat, lon, region)} keyed by folded names, read once per process.
+
+    A row with an empty city is the country's reference point, used when the
+    supplier's city is not listed.
+    """
+    global _gazetteer
+    if _gazetteer is None:
+        places = {}
+        with open(GAZETTEER_PATH, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                places[(_fold(row["city"]), _fold(row["country"]))] = (
+                    float(row["lat"]), float(row["lon"]), row["region"])
+        _gazetteer = places
+    return _gazetteer
+
+
+def locate(city, country):
+    """(lat, lon, region) of a city, else of its country; None if neither is listed."""
+    places = load_gazetteer()
+    country = _fold_country(country)
+    return places.get((_fold(city), country)) or places.get(("", country))
+
+
+def resolve_destination(destination=DESTINATION):
+    city, _, country = destination.rpartition(",")
+    place = locate(city, country)
+    if place is None:
+        raise ValueError(f"Unknown destination {destination!r}; use a city and country from {GAZETTEER_PATH}")
+    return place
+
+
+# --- DISTANCES ---
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km; arguments are degrees and broadcast like numpy arrays."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(x, dtype=np.float64)) for x in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def great_circle(cities, countries, destination=DESTINATION):
+    """(km, same_region) arrays for each origin; km is NaN where the origin is unknown."""
+    dest_lat, dest_lon, dest_region = resolve_destination(destination)
+    places = [locate(city, country) for city, country in zip(cities, countries)]
+    lat = np.array([p[0] if p else np.nan for p in places], dtype=np.float64)
+    lon = np.array([p[1] if p else np.nan for p in places], dtype=np.float64)
+    same_region = np.array([p is not None and p[2] == dest_region for p in places], dtype=bool)
+    return haversine_km(lat, lon, dest_lat, dest_lon), same_region
+
+
+def route_distances(km, same_region, mode="auto"):
+    """{distance column: km} for a great-circle leg sent by `mode` (see ROUTES).
+
+    Columns the route does not use are 0; unknown origins (NaN km) stay NaN.
+    """
+    if mode not in ROUTES:
+        raise ValueError(f"Unknown route mode {mode!r}; expected one of {', '.join(ROUTES)}")
+    km = np.asarray(km, dtype=np.float64)
+    same_region = np.asarray(same_region, dtype=bool)
+    applies = {None: True, "same_region": same_region, "other_region": ~same_region}
+    distances = {column: km * 0.0 for column in DISTANCE_COLUMNS}
+    for column, (detour, when) in ROUTES[mode].items():
+        distances[column] = np.where(applies[when], km * DETOUR_FACTORS[detour], km * 0.0)
+    return distances
+
+
+# --- CACHE ---
+def _destination_key(destination):
+    lat, lon, region = resolve_destination(destination)
+    return f"{lat:.4f},{lon:.4f},{region}"
+
+
+def cached_great_circle(db_path, cities, countries, destination=DESTINATION):
+    """great_circle() backed by the geo_distance_cache table of `db_path`.
+
+    Each distinct (city, country) is looked up once, keyed on the folded
+    spelling so "Paris" and "paris " share a row; those missing from the
+    cache are computed in one vectorized pass and stored, so an origin is
+    never computed twice for the same destination. Origins the gazetteer does
+    not know are not cached and come back as NaN.
+    """
+    origins = [(_fold(city), _fold_country(country)) for city, country in zip(cities, countries)]
+    distinct = list(dict.fromkeys(origins))
+    key = _destination_key(destination)
+    with open_db(db_path) as db, db.read() as conn:
+        known = {
+            (city, country): (km, same) for city, country, km, same in conn.execute(
+                "SELECT origin_city, origin_country, great_circle_km, same_region "
+                "FROM geo_distance_cache WHERE destination = ?", (key,))
+        }
+    new = [origin for origin in distinct if origin not in known]
+    if new:
+        km, same_region = great_circle([c for c, _ in new], [k for _, k in new], destination)
+        rows = [(key, city, country, float(d), int(s))
+                for (city, country), d, s in zip(new, km, same_region) if not np.isnan(d)]
+        if rows:
+            with open_db(db_path) as db, db.write() as conn:
+                conn.executemany("INSERT OR IGNORE INTO geo_distance_cache VALUES (?, ?, ?, ?, ?)", rows)
+            known.update(((city, country), (d, s)) for _, city, country, d, s in rows)
+
+    lookup = [known.get(origin, (np.nan, 0)) for origin in distinct]
+    position = {origin: i for i, origin in enumerate(distinct)}
+    index = np.fromiter((position[origin] for origin in origins), dtype=np.int64, count=len(origins))
+    km = np.array([d for d, _ in lookup], dtype=np.float64)
+    same_region = np.array([s for _, s in lookup], dtype=bool)
+    return km[index], same_region[index]
+
+
+# --- FILLING ---
+def fill_missing_distances(cols, db_path, destination=DESTINATION, mode="auto", rows=None):
+    """Estimate distances in place for rows that have none (all three 0); returns rows filled.
+
+    `cols` maps column names to arrays, as in supplier_import.prepare_chunk;
+    `rows` is an optional boolean mask of the rows to consider. Call it before
+    the totals are computed. Origins missing from the gazetteer keep their zeros.
+    """
+    missing = np.ones(len(cols["location_city"]), dtype=bool)
+    for column in DISTANCE_COLUMNS:
+        missing &= np.asarray(cols[column], dtype=np.float64) == 0
+    if rows is not None:
+        missing &= np.asarray(rows, dtype=bool)
+    index = np.flatnonzero(missing)
+    if not len(index):
+        return 0
+    km, same_region = cached_great_circle(
+        db_path, np.asarray(cols["location_city"], dtype=object)[index],
+        np.asarray(cols["location_country"], dtype=object)[index], destination)
+    found = ~np.isnan(km)
+    for column, values in route_distances(km, same_region, mode).items():
+        filled = np.array(cols[column], dtype=np.float64)
+        filled[index[found]] = values[found]
+        cols[column] = filled
+    return int(found.sum())
+
+
+def fill_supplier_distances(db_path, destination=DESTINATION, mode="auto"):
+    """Estimate distances of stored suppliers that have none, totals included; returns rows filled.
+
+    New origins go through the cache first, then a single UPDATE joins
+    suppliers to geo_distance_cache, so the pass is set-based whatever the
+    table size. Stored road distances already include the reuse return trips,
+    which do not count as a distance of their own.
+    """
+    if mode not in ROUTES:
+        raise ValueError(f"Unknown route mode {mode!r}; expected one of {', '.join(ROUTES)}")
+    reuse_km = ("(CASE WHEN reusable <> 0 AND reuse_count <> 0 AND return_km <> 0 "
+                "THEN reuse_count * return_km ELSE 0.0 END)")
+    missing = f"distance_sea_km = 0 AND distance_air_km = 0 AND distance_road_km = {reuse_km}"
+    with open_db(db_path) as db, db.read() as conn:
+        origins = conn.execute(
+            f"SELECT DISTINCT location_city, location_country FROM suppliers WHERE {missing}").fetchall()
+    if not origins:
+        return 0
+    cached_great_circle(db_path, [city for city, _ in origins], [country for _, country in origins], destination)
+
+    conditions = {None: "1", "same_region": "c.same_region", "other_region": "NOT c.same_region"}
+    expr = {column: "0.0" for column in DISTANCE_COLUMNS}
+    for column, (detour, when) in ROUTES[mode].items():
+        expr[column] = f"(CASE WHEN {conditions[when]} THEN c.great_circle_km * :{detour} ELSE 0.0 END)"
+    expr["distance_road_km"] = f"({expr['distance_road_km']} + {reuse_km})"
+    names = ["quantity_units", "unit_weight_kg", "price_per_unit", "delivery_cost_sea", "delivery_cost_road",
+             "end_of_life_cost_per_kg", "emission_factor_prod", "emission_factor_sea", "emission_factor_road",
+             "emission_factor_air", "emission_factor_eol"]
+    total_cost, total_emissions = totals_sql({**{name: name for name in names}, **expr})
+    # SET expressions all see the row as it was before the update
+    assignments = [f"{column} = {expr[column]}" for column in DISTANCE_COLUMNS]
+    assignments += [f"total_cost = {total_cost}", f"total_emissions = {total_emissions}"]
+    with open_db(db_path) as db, db.write() as conn:
+        # the cache is keyed on folded names, as in cached_great_circle
+        conn.create_function("geo_fold", 1, _fold, deterministic=True)
+        conn.create_function("geo_fold_country", 1, _fold_country, deterministic=True)
+        return conn.execute(f"""
+            UPDATE suppliers SET {', '.join(assignments)}
+            FROM geo_distance_cache AS c
+            WHERE c.destination = :destination
+                AND c.origin_city = geo_fold(suppliers.location_city)
+                AND c.origin_country = geo_fold_country(suppliers.location_country)
+                AND {missing}
+        """, {**DETOUR_FACTORS, "destination": _destination_key(destination)}).rowcount
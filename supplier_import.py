@@ -0,0 +1,158 @@
+# Streaming bulk import of supplier lists (CSV / Excel)
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from supplier_calc import compute_totals
+from supplier_db import FLAG_COLUMNS, RISK_LEVELS, SUPPLIER_COLUMNS, insert_suppliers, new_id, open_db
+from supplier_geo import DESTINATION, fill_missing_distances
+
+CHUNK_SIZE = 5000
+
+TEXT_COLUMNS = ["name", "location_city", "location_country"]
+NUMERIC_COLUMNS = [
+    "quantity_units",
+    "price_per_unit",
+    "unit_weight_kg",
+    "distance_sea_km",
+    "distance_road_km",
+    "distance_air_km",
+    "delivery_cost_sea",
+    "delivery_cost_road",
+    "end_of_life_cost_per_kg",
+    "emission_factor_prod",
+    "emission_factor_sea",
+    "emission_factor_road",
+    "emission_factor_air",
+    "emission_factor_eol",
+    "reuse_count",
+    "return_km",
+]
+
+
+# --- READERS ---
+def _is_excel(source, filename=None):
+    name = filename or (source if isinstance(source, (str, os.PathLike)) else getattr(source, "name", ""))
+    return str(name).lower().endswith((".xlsx", ".xlsm"))
+
+
+def _iter_excel_chunks(source, chunksize):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(h).strip() if h is not None else "" for h in next(rows, [])]
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == chunksize:
+                yield pd.DataFrame(batch, columns=header)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header)
+    finally:
+        workbook.close()
+
+
+def iter_chunks(source, chunksize=CHUNK_SIZE, filename=None):
+    """Yield the file as DataFrames of at most `chunksize` rows."""
+    if _is_excel(source, filename):
+        yield from _iter_excel_chunks(source, chunksize)
+    else:
+        yield from pd.read_csv(source, chunksize=chunksize, dtype=str, keep_default_na=False)
+
+
+# --- VALIDATION ---
+def prepare_chunk(chunk, estimate=None):
+    """Validate one raw chunk and compute its totals.
+
+    Returns (rows ready for insert_suppliers, number of rejected rows). Missing
+    numeric cells default to 0, missing Yes/No flags to "No"; rows without a
+    name, with non-numeric or negative values or an unknown risk are rejected.
+    `estimate(cols, valid)` may fill in columns (distances) before the totals.
+    """
+    chunk = chunk.rename(columns=lambda c: str(c).strip())
+    n = len(chunk)
+    valid = np.ones(n, dtype=bool)
+    cols = {}
+
+    for col in TEXT_COLUMNS:
+        values = chunk[col] if col in chunk else pd.Series([""] * n, index=chunk.index)
+        cols[col] = values.fillna("").astype(str).str.strip()
+    valid &= (cols["name"] != "").to_numpy()
+
+    for col in NUMERIC_COLUMNS:
+        if col not in chunk:
+            cols[col] = np.zeros(n)
+            continue
+        raw = chunk[col].replace("", np.nan)
+        values = pd.to_numeric(raw, errors="coerce").to_numpy(dtype=np.float64)
+        valid &= ~(np.isnan(values) & raw.notna().to_numpy())
+        values = np.nan_to_num(values, nan=0.0)
+        valid &= values >= 0
+        cols[col] = values
+
+    # files use the labels people type; the table stores 0/1 flags and 1-3 risk levels
+    for col in FLAG_COLUMNS:
+        values = chunk[col] if col in chunk else pd.Series(["No"] * n, index=chunk.index)
+        values = values.fillna("No").astype(str).str.strip().str.capitalize().replace("", "No")
+        valid &= values.isin(["Yes", "No"]).to_numpy()
+        cols[col] = (values == "Yes").astype(int)
+
+    risk = chunk["deforestation_risk"] if "deforestation_risk" in chunk else pd.Series(["Low"] * n, index=chunk.index)
+    risk = risk.fillna("Low").astype(str).str.strip().str.capitalize().replace("", "Low")
+    level = risk.map(RISK_LEVELS)
+    valid &= level.notna().to_numpy()
+    cols["deforestation_risk"] = level.fillna(0).astype(int)
+
+    # the form only asks for reuse figures when the packaging is reusable
+    not_reused = (cols["reusable"] == 0).to_numpy()
+    cols["reuse_count"] = np.where(not_reused, 0.0, cols["reuse_count"])
+    cols["return_km"] = np.where(not_reused, 0.0, cols["return_km"])
+
+    if estimate:
+        estimate(cols, valid)
+    cols.update(compute_totals(cols))
+
+    frame = pd.DataFrame({col: cols[col] for col in SUPPLIER_COLUMNS[1:-1]}).loc[valid]
+    created_at = datetime.utcnow().isoformat()
+    rows = [
+        (new_id(),) + values + (created_at,)
+        for values in frame.itertuples(index=False, name=None)
+    ]
+    return rows, n - len(frame)
+
+
+# --- IMPORT ---
+def import_suppliers(source, db_path, chunksize=CHUNK_SIZE, filename=None, on_chunk=None,
+                     distance_mode="auto", destination=DESTINATION):
+    """Stream `source` into the suppliers table, one transaction per chunk.
+
+    Memory stays bounded by `chunksize` whatever the file size. Rows without
+    any distance get estimates towards `destination` (see supplier_geo; pass
+    distance_mode=None to keep them at 0). `on_chunk` is called with the
+    running report after every committed chunk. Returns a dict with imported /
+    rejected / distances_estimated counts, elapsed seconds and rows per second.
+    """
+    report = {"imported": 0, "rejected": 0, "distances_estimated": 0, "seconds": 0.0, "rows_per_sec": 0.0}
+    started = time.perf_counter()
+
+    def estimate(cols, valid):
+        report["distances_estimated"] += fill_missing_distances(cols, db_path, destination, distance_mode, valid)
+
+    with open_db(db_path) as db:
+        for chunk in iter_chunks(source, chunksize, filename):
+            rows, rejected = prepare_chunk(chunk, estimate if distance_mode else None)
+            with db.write() as conn:
+                insert_suppliers(conn, rows)
+            report["imported"] += len(rows)
+            report["rejected"] += rejected
+            report["seconds"] = time.perf_counter() - started
+            report["rows_per_sec"] = report["imported"] / report["seconds"] if report["seconds"] else 0.0
+            if on_chunk:
+                on_chunk(report)
+    return report
@@ -0,0 +1,207 @@
+# Monte Carlo emissions uncertainty with parallel rank-probability estimation
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from supplier_scoring import BENEFIT, decision_matrix
+
+FACTORS = [
+    "emission_factor_prod",
+    "emission_factor_sea",
+    "emission_factor_road",
+    "emission_factor_air",
+    "emission_factor_eol",
+]
+
+# (distribution, relative half-width) around the entered point estimate. Both
+# distributions are bounded, which lets every worker histogram emissions on a
+# fixed per-supplier range and merge histograms exactly.
+DEFAULT_UNCERTAINTY = {
+    "emission_factor_prod": ("triangular", 0.2),
+    "emission_factor_sea": ("triangular", 0.3),
+    "emission_factor_road": ("triangular", 0.2),
+    "emission_factor_air": ("triangular", 0.3),
+    "emission_factor_eol": ("uniform", 0.4),
+}
+
+# Draws (samples x suppliers x factors) generated per batch; bounds peak memory
+CHUNK_CELLS = 2_000_000
+
+
+# --- SETUP ---
+def emission_terms(df):
+    """Per-supplier point factors and the coefficients they multiply (both n x 5).
+
+    total_emissions is linear in the factors: prod and eol multiply the units,
+    transport factors multiply tonnes x km. Stored road distance and production
+    factor already include the reuse adjustment.
+    """
+    quantity = df["quantity_units"].to_numpy(dtype=np.float64)
+    tonnes = df["unit_weight_kg"].to_numpy(dtype=np.float64) * quantity / 1000.0
+    coefficients = np.column_stack([
+        quantity,
+        tonnes * df["distance_sea_km"].to_numpy(dtype=np.float64),
+        tonnes * df["distance_road_km"].to_numpy(dtype=np.float64),
+        tonnes * df["distance_air_km"].to_numpy(dtype=np.float64),
+        quantity,
+    ])
+    factors = df[FACTORS].to_numpy(dtype=np.float64)
+    return factors, coefficients
+
+
+def _multiplier_bounds(uncertainty):
+    spreads = np.array([uncertainty[f][1] for f in FACTORS])
+    return np.maximum(1.0 - spreads, 0.0), 1.0 + spreads
+
+
+def _draw_multipliers(rng, uncertainty, size):
+    draws = np.empty(size + (len(FACTORS),))
+    for j, factor in enumerate(FACTORS):
+        kind, spread = uncertainty[factor]
+        low, high = max(1.0 - spread, 0.0), 1.0 + spread
+        if spread == 0:
+            draws[..., j] = 1.0
+        elif kind == "triangular":
+            draws[..., j] = rng.triangular(low, 1.0, high, size)
+        elif kind == "uniform":
+            draws[..., j] = rng.uniform(low, high, size)
+        else:
+            raise ValueError(f"Unknown distribution {kind!r} for {factor}")
+    return draws
+
+
+# --- WORKER ---
+def _simulate(task):
+    """Run `samples` draws and return mergeable aggregates (sums, histograms, rank counts)."""
+    (terms, fixed, weights, benefit, uncertainty, lo, hi, bins, positions, samples, seed) = task
+    rng = np.random.default_rng(seed)
+    n = len(terms)
+
+    # Fixed criteria (everything but emissions) contribute a constant term to each distance.
+    norms = np.sqrt((fixed ** 2).sum(axis=0))
+    scale = np.divide(weights, norms, out=np.zeros_like(norms), where=norms > 0)
+    scale[1] = 0.0
+    best = np.where(benefit, fixed.max(axis=0), fixed.min(axis=0))
+    worst = np.where(benefit, fixed.min(axis=0), fixed.max(axis=0))
+    fixed_pos = ((fixed - best) ** 2) @ scale ** 2
+    fixed_neg = ((fixed - worst) ** 2) @ scale ** 2
+    emissions_weight = weights[1]
+    emissions_benefit = benefit[1]
+
+    agg = {
+        "samples": 0,
+        "emissions_sum": np.zeros(n),
+        "emissions_sq": np.zeros(n),
+        "closeness_sum": np.zeros(n),
+        "closeness_sq": np.zeros(n),
+        "histogram": np.zeros(n * bins, dtype=np.int64),
+        "rank_counts": np.zeros(n * positions, dtype=np.int64),
+    }
+    width = np.where(hi > lo, hi - lo, 1.0)
+    rows = np.arange(n)
+    batch = max(1, CHUNK_CELLS // (n * len(FACTORS)))
+    for start in range(0, samples, batch):
+        size = min(batch, samples - start)
+        emissions = (_draw_multipliers(rng, uncertainty, (size, n)) * terms).sum(axis=2)
+
+        e_norm = np.sqrt((emissions ** 2).sum(axis=1, keepdims=True))
+        e_scale = np.divide(emissions_weight, e_norm, out=np.zeros_like(e_norm), where=e_norm > 0)
+        e_min = emissions.min(axis=1, keepdims=True)
+        e_max = emissions.max(axis=1, keepdims=True)
+        e_best, e_worst = (e_max, e_min) if emissions_benefit else (e_min, e_max)
+        d_pos = np.sqrt(fixed_pos + (e_scale * (emissions - e_best)) ** 2)
+        d_neg = np.sqrt(fixed_neg + (e_scale * (emissions - e_worst)) ** 2)
+        total = d_pos + d_neg
+        closeness = np.divide(d_neg, total, out=np.zeros_like(total), where=total > 0)
+
+        agg["samples"] += size
+        agg["emissions_sum"] += emissions.sum(axis=0)
+        agg["emissions_sq"] += (emissions ** 2).sum(axis=0)
+        agg["closeness_sum"] += closeness.sum(axis=0)
+        agg["closeness_sq"] += (closeness ** 2).sum(axis=0)
+
+        bin_index = np.clip(((emissions - lo) / width * bins).astype(np.int64), 0, bins - 1)
+        agg["histogram"] += np.bincount((rows * bins + bin_index).ravel(), minlength=n * bins)
+
+        top = np.argpartition(-closeness, positions - 1, axis=1)[:, :positions]
+        order = np.take_along_axis(top, np.argsort(-np.take_along_axis(closeness, top, axis=1), axis=1), axis=1)
+        agg["rank_counts"] += np.bincount((order * positions + np.arange(positions)).ravel(),
+                                          minlength=n * positions)
+    return agg
+
+
+def _merge(results):
+    merged = results[0]
+    for agg in results[1:]:
+        for key, value in agg.items():
+            merged[key] = merged[key] + value
+    return merged
+
+
+def _histogram_quantiles(histogram, lo, hi, quantiles):
+    cdf = np.cumsum(histogram, axis=1) / histogram.sum(axis=1, keepdims=True)
+    bins = histogram.shape[1]
+    out = np.empty((len(histogram), len(quantiles)))
+    for k, q in enumerate(quantiles):
+        idx = np.minimum((cdf < q).sum(axis=1), bins - 1)
+        below = np.where(idx > 0, cdf[np.arange(len(cdf)), idx - 1], 0.0)
+        inside = cdf[np.arange(len(cdf)), idx] - below
+        frac = np.divide(q - below, inside, out=np.zeros_like(inside), where=inside > 0)
+        out[:, k] = lo + (idx + frac) / bins * (hi - lo)
+    return out
+
+
+# --- ENTRY POINT ---
+def monte_carlo(df, weights, samples=100_000, uncertainty=None, confidence=0.95,
+                workers=None, seed=None, bins=400, max_positions=10, benefit=BENEFIT):
+    """Sample uncertain emission factors and re-rank suppliers for every sample.
+
+    Samples are split across a process pool; each worker streams its share in
+    bounded batches and returns only aggregates, so memory does not grow with
+    `samples`. Returns per-supplier emissions mean / std / confidence interval,
+    closeness mean / std and the probability of each of the first
+    `max_positions` rank positions (n x positions).
+    """
+    uncertainty = {**DEFAULT_UNCERTAINTY, **(uncertainty or {})}
+    factors, coefficients = emission_terms(df)
+    terms = factors * coefficients
+    fixed = decision_matrix(df)
+    weights = np.asarray(weights, dtype=np.float64)
+    n = len(df)
+    positions = min(n, max_positions)
+
+    low, high = _multiplier_bounds(uncertainty)
+    lo = terms @ low
+    hi = terms @ high
+
+    workers = workers or os.cpu_count() or 1
+    tasks = max(1, min(workers * 4, samples // 10_000 or 1))
+    shares = [samples // tasks + (1 if i < samples % tasks else 0) for i in range(tasks)]
+    seeds = np.random.SeedSequence(seed).spawn(tasks)
+    payload = [
+        (terms, fixed, weights, np.asarray(benefit), uncertainty, lo, hi, bins, positions, share, s)
+        for share, s in zip(shares, seeds) if share
+    ]
+    if workers == 1 or len(payload) == 1:
+        results = [_simulate(task) for task in payload]
+    else:
+        # spawn: forking a threaded server (Streamlit) can deadlock the children
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            results = list(pool.map(_simulate, payload))
+    agg = _merge(results)
+
+    count = agg["samples"]
+    e_mean = agg["emissions_sum"] / count
+    c_mean = agg["closeness_sum"] / count
+    tail = (1.0 - confidence) / 2.0
+    return {
+        "samples": count,
+        "emissions_mean": e_mean,
+        "emissions_std": np.sqrt(np.maximum(agg["emissions_sq"] / count - e_mean ** 2, 0.0)),
+        "emissions_ci": _histogram_quantiles(agg["histogram"].reshape(n, bins), lo, hi, [tail, 1.0 - tail]),
+        "closeness_mean": c_mean,
+        "closeness_std": np.sqrt(np.maximum(agg["closeness_sq"] / count - c_mean ** 2, 0.0)),
+        "rank_probability": agg["rank_counts"].reshape(n, positions) / count,
+    }
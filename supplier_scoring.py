@@ -0,0 +1,308 @@
+# AHP weighting and TOPSIS ranking shared by the supplier apps
+import threading
+
+import numpy as np
+
+from supplier_db import (
+    add_close_listener, add_insert_listener, constraint_clause, iter_decision_chunks, load_decision_matrix, open_db,
+    refresh_frontier,
+)
+
+# Rows per block in streaming_topsis; bounds peak memory independently of table size
+STREAM_CHUNK_ROWS = 50_000
+
+CRITERIA = ["Total Cost", "Total Emissions", "Deforestation", "Recyclability"]
+# Cost and emissions are minimized; deforestation is scored 3 (Low risk) .. 1 (High
+# risk) and recyclability 1/0, so both are maximized.
+BENEFIT = np.array([False, False, True, True])
+
+
+# --- AHP ---
+def ahp_weights(pairwise_matrix):
+    """Weights from a pairwise comparison matrix (normalized column averages)."""
+    pairwise_matrix = np.asarray(pairwise_matrix, dtype=np.float64)
+    weights = (pairwise_matrix / pairwise_matrix.sum(axis=0)).mean(axis=1)
+    return weights / weights.sum()
+
+
+# --- TOPSIS ---
+def decision_matrix(df):
+    """Criteria matrix (n x 4, float64) in CRITERIA order from an already loaded DataFrame.
+
+    Prefer supplier_db.load_decision_matrix when the frame is not needed otherwise.
+    """
+    # missing values take the same defaults as supplier_db.CRITERIA_SQL
+    matrix = np.empty((len(df), len(CRITERIA)), dtype=np.float64)
+    matrix[:, 0] = df["total_cost"].fillna(0.0).to_numpy(dtype=np.float64)
+    matrix[:, 1] = df["total_emissions"].fillna(0.0).to_numpy(dtype=np.float64)
+    matrix[:, 2] = 4 - df["deforestation_risk"].fillna(3).to_numpy(dtype=np.float64)
+    matrix[:, 3] = df["recyclability"].fillna(0).to_numpy(dtype=np.float64)
+    return matrix
+
+
+def criteria_row(data):
+    """One supplier dict (as passed to save_supplier) as a CRITERIA-ordered row."""
+    def value(col, default):
+        return default if data[col] is None else float(data[col])
+
+    return [
+        value("total_cost", 0.0),
+        value("total_emissions", 0.0),
+        4.0 - value("deforestation_risk", 3.0),
+        value("recyclability", 0.0),
+    ]
+
+
+def column_scale(sum_squares, weights):
+    """Per-criterion factor weight / norm that takes raw values to the weighted normalized matrix.
+
+    An all-zero criterion contributes nothing instead of turning every score into NaN.
+    """
+    norms = np.sqrt(sum_squares)
+    return np.divide(weights, norms, out=np.zeros_like(norms), where=norms > 0)
+
+
+def closeness_from_distances(d_pos, d_neg):
+    """Closeness coefficient d_neg / (d_pos + d_neg); 0 where both distances are 0."""
+    total = d_pos + d_neg
+    return np.divide(d_neg, total, out=np.zeros_like(total), where=total > 0)
+
+
+def topsis_steps(matrix, weights, benefit=BENEFIT):
+    """Full from-scratch TOPSIS, returning every intermediate step."""
+    matrix = np.asarray(matrix, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    norms = np.sqrt((matrix ** 2).sum(axis=0))
+    normalized = matrix / np.where(norms > 0, norms, 1.0)
+    weighted = normalized * weights
+    ideal = np.where(benefit, weighted.max(axis=0), weighted.min(axis=0))
+    nadir = np.where(benefit, weighted.min(axis=0), weighted.max(axis=0))
+    d_pos = np.sqrt(((weighted - ideal) ** 2).sum(axis=1))
+    d_neg = np.sqrt(((weighted - nadir) ** 2).sum(axis=1))
+    return {
+        "normalized": normalized,
+        "weighted": weighted,
+        "ideal": ideal,
+        "nadir": nadir,
+        "d_pos": d_pos,
+        "d_neg": d_neg,
+        "closeness": closeness_from_distances(d_pos, d_neg),
+    }
+
+
+def topsis(matrix, weights, benefit=BENEFIT):
+    """Closeness coefficient of every row (higher is better)."""
+    return topsis_steps(matrix, weights, benefit)["closeness"]
+
+
+def top_k_indices(scores, k=None):
+    """Indices of the k highest scores, best first; argpartition avoids sorting all n."""
+    scores = np.asarray(scores)
+    n = len(scores)
+    if k is None or k >= n:
+        return np.argsort(-scores, kind="stable")
+    if k <= 0:
+        return np.arange(0)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+# --- SHORTLIST ---
+def shortlist_ranking(db_path, weights, constraints, k=None, benefit=BENEFIT):
+    """(names, scores) of suppliers passing the hard limits in `constraints`, best first.
+
+    The limits run as indexed SQL predicates (see supplier_db.constraint_clause),
+    and TOPSIS normalizes over the survivors only. With `k`, only the best k
+    are returned. An empty result means no supplier qualifies; see
+    supplier_db.explain_empty_shortlist. With frontier_only, dominated
+    suppliers are dropped before TOPSIS runs.
+    """
+    if constraints.get("frontier_only"):
+        refresh_frontier(db_path)
+    where, params = constraint_clause(constraints)
+    names, matrix = load_decision_matrix(db_path, where, params, ordered=False)
+    if not names:
+        return [], np.empty(0)
+    scores = topsis(matrix, weights, benefit)
+    order = top_k_indices(scores, k)
+    return [names[i] for i in order], scores[order]
+
+
+# --- STREAMING ---
+def streaming_topsis(db_path, weights, benefit=BENEFIT, chunk_rows=STREAM_CHUNK_ROWS,
+                     dtype=np.float64, where="", params=()):
+    """Two-pass TOPSIS over the suppliers cursor, yielding (names, closeness) per block.
+
+    The first pass accumulates column sums of squares and min/max, which fix
+    the norms and the weighted ideal / nadir (the weighted scale is positive,
+    so raw extremes stay extremes). The second pass scores each block as it is
+    fetched. Only one block is held at a time; with dtype=np.float32 the blocks
+    are scored in single precision while the pass-one sums stay in float64.
+    Both passes read inside one transaction, so they see the same rows.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    m = len(weights)
+    with open_db(db_path) as db, db.read() as conn:
+        conn.execute("BEGIN")
+        try:
+            sum_squares = np.zeros(m)
+            col_min = np.full(m, np.inf)
+            col_max = np.full(m, -np.inf)
+            for _, block in iter_decision_chunks(conn, chunk_rows, dtype, where, params):
+                sum_squares += np.square(block, dtype=np.float64).sum(axis=0)
+                col_min = np.minimum(col_min, block.min(axis=0))
+                col_max = np.maximum(col_max, block.max(axis=0))
+
+            scale = column_scale(sum_squares, weights).astype(dtype)
+            ideal = np.where(benefit, col_max, col_min).astype(dtype) * scale
+            nadir = np.where(benefit, col_min, col_max).astype(dtype) * scale
+            for names, block in iter_decision_chunks(conn, chunk_rows, dtype, where, params):
+                block *= scale
+                d_pos = np.sqrt(np.square(block - ideal).sum(axis=1))
+                d_neg = np.sqrt(np.square(block - nadir).sum(axis=1))
+                yield names, closeness_from_distances(d_pos, d_neg)
+        finally:
+            conn.rollback()
+
+
+def streaming_top_k(db_path, weights, k, **options):
+    """(names, scores) of the k best suppliers from streaming_topsis, best first.
+
+    Only k candidates are kept between blocks (argpartition per block).
+    """
+    best_names, best_scores = [], np.empty(0)
+    for names, scores in streaming_topsis(db_path, weights, **options):
+        scores = np.concatenate([best_scores, scores])
+        names = best_names + names
+        if len(scores) > k:
+            keep = np.argpartition(-scores, k - 1)[:k]
+            names = [names[i] for i in keep]
+            scores = scores[keep]
+        best_names, best_scores = names, scores
+    order = np.argsort(-best_scores, kind="stable")
+    return [best_names[i] for i in order], best_scores[order]
+
+
+# --- INCREMENTAL ENGINE ---
+class IncrementalTopsis:
+    """TOPSIS ranking that absorbs inserted rows without a full recomputation.
+
+    Per-criterion sums of squares and min/max are updated in O(1) per insert.
+    Squared deviations from the raw ideal / nadir are cached per row: they only
+    need recomputing when an insert moves the ideal or nadir. Otherwise a new
+    weight vector or a new column norm just rescales them, so scoring is one
+    (n x 4) matrix-vector product.
+    """
+
+    def __init__(self, matrix=None, benefit=BENEFIT, labels=None, version=None):
+        self.benefit = np.asarray(benefit, dtype=bool)
+        self.version = version
+        self.labels = []
+        self._lock = threading.Lock()
+        m = len(self.benefit)
+        self._rows = np.empty((64, m))
+        self._dev_pos = np.empty((64, m))
+        self._dev_neg = np.empty((64, m))
+        self.n = 0
+        self.sum_squares = np.zeros(m)
+        self.col_min = np.full(m, np.inf)
+        self.col_max = np.full(m, -np.inf)
+        self._stale = True
+        if matrix is not None and len(matrix):
+            self.extend(matrix, labels)
+
+    @property
+    def matrix(self):
+        return self._rows[:self.n]
+
+    def _reserve(self, n):
+        if n <= len(self._rows):
+            return
+        capacity = max(n, 2 * len(self._rows))
+        for name in ("_rows", "_dev_pos", "_dev_neg"):
+            grown = np.empty((capacity, len(self.benefit)))
+            grown[:self.n] = getattr(self, name)[:self.n]
+            setattr(self, name, grown)
+
+    def _extremes(self):
+        ideal = np.where(self.benefit, self.col_max, self.col_min)
+        nadir = np.where(self.benefit, self.col_min, self.col_max)
+        return ideal, nadir
+
+    def extend(self, rows, labels=None):
+        rows = np.atleast_2d(np.asarray(rows, dtype=np.float64))
+        with self._lock:
+            self.labels.extend(labels if labels is not None else [None] * len(rows))
+            start = self.n
+            self._reserve(start + len(rows))
+            self._rows[start:start + len(rows)] = rows
+            self.n += len(rows)
+            self.sum_squares += (rows ** 2).sum(axis=0)
+
+            ideal, nadir = self._extremes()
+            self.col_min = np.minimum(self.col_min, rows.min(axis=0))
+            self.col_max = np.maximum(self.col_max, rows.max(axis=0))
+            new_ideal, new_nadir = self._extremes()
+            if not self._stale and np.array_equal(ideal, new_ideal) and np.array_equal(nadir, new_nadir):
+                self._dev_pos[start:self.n] = (rows - ideal) ** 2
+                self._dev_neg[start:self.n] = (rows - nadir) ** 2
+            else:
+                self._stale = True
+
+    def add(self, row, label=None):
+        """Absorb one inserted supplier row (CRITERIA order)."""
+        self.extend([row], [label])
+
+    def scores(self, weights):
+        """Closeness of every row under `weights`, identical to topsis() on the same matrix."""
+        return self.labelled_scores(weights)[1]
+
+    def labelled_scores(self, weights):
+        """(labels, scores) taken consistently while inserts may be arriving."""
+        with self._lock:
+            if self._stale:
+                ideal, nadir = self._extremes()
+                self._dev_pos[:self.n] = (self.matrix - ideal) ** 2
+                self._dev_neg[:self.n] = (self.matrix - nadir) ** 2
+                self._stale = False
+            scale = column_scale(self.sum_squares, np.asarray(weights, dtype=np.float64)) ** 2
+            d_pos = np.sqrt(self._dev_pos[:self.n] @ scale)
+            d_neg = np.sqrt(self._dev_neg[:self.n] @ scale)
+            labels = list(self.labels)
+        return labels, closeness_from_distances(d_pos, d_neg)
+
+    def snapshot(self):
+        """(labels, matrix copy) taken consistently while inserts may be arriving."""
+        with self._lock:
+            return list(self.labels), self.matrix.copy()
+
+
+# --- PER-DATABASE ENGINES ---
+_engines = {}
+
+
+def ranking_engine(db_path):
+    """IncrementalTopsis over the suppliers table, labelled with supplier names.
+
+    save_supplier feeds new rows to the engine; any other change to the
+    database (imports, edits from another process) triggers a rebuild.
+    """
+    with open_db(db_path) as db:
+        version = db.data_version()
+        engine = _engines.get(db_path)
+        if engine is None or engine.version != version:
+            names, matrix = load_decision_matrix(db_path)
+            engine = IncrementalTopsis(matrix, labels=names, version=version)
+            _engines[db_path] = engine
+    return engine
+
+
+def _on_insert(db_path, data, version_before, version_after):
+    engine = _engines.get(db_path)
+    if engine is not None and engine.version == version_before:
+        engine.add(criteria_row(data), data["name"])
+        engine.version = version_after
+
+
+add_insert_listener(_on_insert)
+add_close_listener(lambda db_path: _engines.pop(db_path, None))
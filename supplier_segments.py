@@ -0,0 +1,98 @@
+# Segmented AHP-TOPSIS: rank suppliers within each market / risk class in parallel
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from supplier_db import load_segmented_matrix
+from supplier_scoring import BENEFIT, closeness_from_distances, column_scale
+
+SEGMENT_COLUMNS = ["location_country", "location_city", "deforestation_risk", "reusable", "recyclability"]
+
+# Below this many rows spawning workers costs more than it saves
+PARALLEL_MIN_ROWS = 200_000
+
+
+# --- WORKER ---
+def _rank_segments(task):
+    """TOPSIS within every segment of a contiguous block of rows.
+
+    `starts` are the block-relative offsets of each segment. Norms and the
+    ideal / nadir come from per-segment reductions (np.*.reduceat), so a block
+    of hundreds of segments is still a handful of vectorized operations.
+    Returns (closeness, rank within segment, ties sharing the best rank).
+    """
+    matrix, starts, weights, benefit = task
+    n = len(matrix)
+    lengths = np.diff(np.append(starts, n))
+    segment = np.repeat(np.arange(len(starts)), lengths)
+
+    scale = column_scale(np.add.reduceat(matrix ** 2, starts, axis=0), weights)
+    weighted = matrix * scale[segment]
+    high = np.maximum.reduceat(weighted, starts, axis=0)
+    low = np.minimum.reduceat(weighted, starts, axis=0)
+    ideal = np.where(benefit, high, low)[segment]
+    nadir = np.where(benefit, low, high)[segment]
+    d_pos = np.sqrt(((weighted - ideal) ** 2).sum(axis=1))
+    d_neg = np.sqrt(((weighted - nadir) ** 2).sum(axis=1))
+    closeness = closeness_from_distances(d_pos, d_neg)
+
+    order = np.lexsort((-closeness, segment))
+    position = np.arange(n)
+    sorted_closeness = closeness[order]
+    first_of_tie = np.ones(n, dtype=bool)
+    first_of_tie[1:] = (sorted_closeness[1:] != sorted_closeness[:-1]) | (segment[order][1:] != segment[order][:-1])
+    tie_start = np.maximum.accumulate(np.where(first_of_tie, position, 0))
+    rank = np.empty(n, dtype=np.int64)
+    rank[order] = tie_start - starts[segment[order]] + 1
+    return closeness, rank
+
+
+def _split_tasks(starts, n, tasks):
+    """Cut the segment list into `tasks` contiguous groups of roughly equal row counts."""
+    cuts = np.searchsorted(starts, np.linspace(0, n, tasks + 1)[1:-1], side="right") - 1
+    cuts = np.unique(np.concatenate([[0], np.maximum(cuts, 0), [len(starts)]]))
+    return [(starts[a], starts[b] if b < len(starts) else n, starts[a:b] - starts[a]) for a, b in zip(cuts, cuts[1:])]
+
+
+# --- ENTRY POINT ---
+def segmented_ranking(db_path, column, weights, benefit=BENEFIT, workers=None, where="", params=()):
+    """AHP-weighted TOPSIS run separately for every value of `column`, merged into one table.
+
+    Normalization and ideal / nadir are per segment, so scores are only
+    comparable within a segment. Segments are grouped into row-balanced blocks
+    that a process pool scores in parallel. Returns a DataFrame sorted by
+    segment and rank with columns [column, name, TOPSIS Score, Rank, Suppliers].
+    """
+    keys, names, matrix = load_segmented_matrix(db_path, column, where, params)
+    n = len(matrix)
+    if not n:
+        return pd.DataFrame(columns=[column, "name", "TOPSIS Score", "Rank", "Suppliers"])
+    lengths = np.array([len(list(group)) for _, group in itertools.groupby(keys)])
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    weights = np.asarray(weights, dtype=np.float64)
+    benefit = np.asarray(benefit)
+
+    workers = workers or os.cpu_count() or 1
+    if n < PARALLEL_MIN_ROWS:
+        workers = 1
+    blocks = _split_tasks(starts, n, min(workers * 4, len(starts)) if workers > 1 else 1)
+    payload = [(matrix[a:b], local, weights, benefit) for a, b, local in blocks]
+    if len(payload) == 1:
+        results = [_rank_segments(task) for task in payload]
+    else:
+        # spawn: forking a threaded server (Streamlit) can deadlock the children
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            results = list(pool.map(_rank_segments, payload))
+
+    table = pd.DataFrame({
+        column: keys,
+        "name": names,
+        "TOPSIS Score": np.concatenate([closeness for closeness, _ in results]),
+        "Rank": np.concatenate([rank for _, rank in results]),
+        "Suppliers": np.repeat(lengths, lengths),
+    })
+    return table.sort_values([column, "Rank"], kind="stable", ignore_index=True)
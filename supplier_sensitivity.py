@@ -0,0 +1,117 @@
+# Weight-sensitivity sweep: batch TOPSIS over many AHP weight vectors at once
+import itertools
+
+import numpy as np
+
+from supplier_scoring import BENEFIT
+
+# Saaty scale, from "extremely less important" to "extremely more important"
+SAATY_SCALE = np.array([1 / 9, 1 / 8, 1 / 7, 1 / 6, 1 / 5, 1 / 4, 1 / 3, 1 / 2, 1, 2, 3, 4, 5, 6, 7, 8, 9])
+
+# Cells of the (n x k) closeness block scored per batch; bounds peak memory
+CHUNK_CELLS = 4_000_000
+
+
+# --- PAIRWISE MATRICES ---
+def _upper_indices(m):
+    return np.triu_indices(m, k=1)
+
+
+def _scale_positions(base):
+    """Index into SAATY_SCALE of each upper-triangle entry of `base` (nearest on a log scale)."""
+    rows, cols = _upper_indices(len(base))
+    upper = np.asarray(base, dtype=np.float64)[rows, cols]
+    return np.abs(np.log(upper)[:, None] - np.log(SAATY_SCALE)[None, :]).argmin(axis=1)
+
+
+def pairwise_from_positions(positions, m):
+    """Build a batch of reciprocal pairwise matrices (k x m x m) from scale positions (k x pairs)."""
+    positions = np.atleast_2d(positions)
+    rows, cols = _upper_indices(m)
+    values = SAATY_SCALE[positions]
+    matrices = np.ones((len(positions), m, m))
+    matrices[:, rows, cols] = values
+    matrices[:, cols, rows] = 1.0 / values
+    return matrices
+
+
+def sample_pairwise_matrices(base, n, notches=1, seed=None):
+    """Randomly move every comparison of `base` by up to `notches` steps on the Saaty scale."""
+    rng = np.random.default_rng(seed)
+    start = _scale_positions(base)
+    offsets = rng.integers(-notches, notches + 1, size=(n, len(start)))
+    positions = np.clip(start + offsets, 0, len(SAATY_SCALE) - 1)
+    return pairwise_from_positions(positions, len(base))
+
+
+def grid_pairwise_matrices(base, notches=1):
+    """Every combination of moving each comparison by -notches..+notches ((2n+1)^pairs matrices)."""
+    start = _scale_positions(base)
+    offsets = np.array(list(itertools.product(range(-notches, notches + 1), repeat=len(start))))
+    positions = np.unique(np.clip(start + offsets, 0, len(SAATY_SCALE) - 1), axis=0)
+    return pairwise_from_positions(positions, len(base))
+
+
+def batch_ahp_weights(matrices):
+    """AHP weights for a batch of pairwise matrices (k x m x m) -> (k x m)."""
+    weights = (matrices / matrices.sum(axis=1, keepdims=True)).mean(axis=2)
+    return weights / weights.sum(axis=1, keepdims=True)
+
+
+# --- BATCH TOPSIS ---
+def rank_stability(matrix, weight_vectors, top_k=3, benefit=BENEFIT, chunk_cells=CHUNK_CELLS):
+    """Score every supplier under every weight vector and summarize rank stability.
+
+    The normalized matrix and squared deviations from the ideal / nadir do not
+    depend on the weights, so each batch of weight vectors is a single
+    (n x m) @ (m x k) product. Batches keep the n x k block below `chunk_cells`.
+    Returns per-supplier arrays: probability of finishing in the top `top_k`,
+    probability of ranking first, and mean / std of the closeness score.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    weight_vectors = np.atleast_2d(np.asarray(weight_vectors, dtype=np.float64))
+    n, k = len(matrix), len(weight_vectors)
+    top_k = min(top_k, n)
+
+    norms = np.sqrt((matrix ** 2).sum(axis=0))
+    normalized = matrix / np.where(norms > 0, norms, 1.0)
+    ideal = np.where(benefit, normalized.max(axis=0), normalized.min(axis=0))
+    nadir = np.where(benefit, normalized.min(axis=0), normalized.max(axis=0))
+    dev_pos = (normalized - ideal) ** 2
+    dev_neg = (normalized - nadir) ** 2
+
+    in_top = np.zeros(n)
+    first = np.zeros(n)
+    score_sum = np.zeros(n)
+    score_sq = np.zeros(n)
+    batch = max(1, chunk_cells // max(n, 1))
+    for start in range(0, k, batch):
+        squared = (weight_vectors[start:start + batch] ** 2).T
+        d_pos = np.sqrt(dev_pos @ squared)
+        d_neg = np.sqrt(dev_neg @ squared)
+        total = d_pos + d_neg
+        closeness = np.divide(d_neg, total, out=np.zeros_like(total), where=total > 0)
+
+        best = np.argpartition(-closeness, top_k - 1, axis=0)[:top_k]
+        in_top += np.bincount(best.ravel(), minlength=n)
+        first += np.bincount(closeness.argmax(axis=0), minlength=n)
+        score_sum += closeness.sum(axis=1)
+        score_sq += (closeness ** 2).sum(axis=1)
+
+    mean = score_sum / k
+    return {
+        "top_k_probability": in_top / k,
+        "first_probability": first / k,
+        "mean_score": mean,
+        "score_std": np.sqrt(np.maximum(score_sq / k - mean ** 2, 0.0)),
+    }
+
+
+def weight_sensitivity(matrix, base_pairwise, n=1000, notches=1, mode="random", top_k=3, seed=None):
+    """Perturb `base_pairwise`, derive all AHP weight vectors and return (weights, stability stats)."""
+    if mode == "grid":
+        matrices = grid_pairwise_matrices(base_pairwise, notches)
+    else:
+        matrices = sample_pairwise_matrices(base_pairwise, n, notches, seed)
+    weights = batch_ahp_weights(matrices)
+    return weights, rank_stability(matrix, weights, top_k)
@@ -0,0 +1,90 @@
+# One SQLite file per tenant (team / workspace) and cross-tenant admin queries
+import os
+import re
+import sqlite3
+
+from supplier_db import MIGRATIONS, ROLLUP_TABLES, DuplicateSuppliersError, get_db
+
+# Tenant files live here; the default tenant keeps the original single-file database
+TENANT_DIR = os.environ.get("SUPPLIER_TENANT_DIR", "tenants")
+DEFAULT_TENANT = "default"
+DEFAULT_DB = "supplier_data.db"
+# SQLite's default SQLITE_MAX_ATTACHED
+MAX_ATTACHED = 10
+
+
+def tenant_slug(tenant):
+    """Lower-case file-safe name: letters, digits, '-' and '_' only."""
+    slug = re.sub(r"[^a-z0-9_-]+", "-", str(tenant).strip().lower()).strip("-")
+    return slug or DEFAULT_TENANT
+
+
+def tenant_db_path(tenant):
+    """Database file for `tenant`; each tenant gets its own file and its own write lock."""
+    slug = tenant_slug(tenant)
+    if slug == DEFAULT_TENANT:
+        return DEFAULT_DB
+    os.makedirs(TENANT_DIR, exist_ok=True)
+    return os.path.join(TENANT_DIR, f"{slug}.db")
+
+
+def list_tenants():
+    """{tenant: db_path} for every tenant with a database file, default first."""
+    tenants = {DEFAULT_TENANT: DEFAULT_DB} if os.path.exists(DEFAULT_DB) else {}
+    if os.path.isdir(TENANT_DIR):
+        for filename in sorted(os.listdir(TENANT_DIR)):
+            if filename.endswith(".db"):
+                tenants[filename[:-3]] = os.path.join(TENANT_DIR, filename)
+    return tenants
+
+
+# --- CROSS-TENANT QUERIES ---
+def aggregate_tenants(tenants=None, grain="month"):
+    """Rollup rows of every tenant in one DataFrame with a leading `tenant` column.
+
+    Instead of opening each file in turn, up to MAX_ATTACHED files are
+    ATTACHed to one in-memory connection and read with a single UNION ALL
+    query per batch. Only the small rollup tables are read. Files on an
+    older schema are migrated first (through get_db); those that cannot be
+    until compacted are left out and listed in the result's
+    attrs["needs_compaction"].
+    """
+    import pandas as pd
+
+    tenants = list_tenants() if tenants is None else tenants
+    latest = MIGRATIONS[-1][0]
+    table = ROLLUP_TABLES[grain]
+    frames = []
+    needs_compaction = []
+    items = list(tenants.items())
+    conn = sqlite3.connect(":memory:")
+    try:
+        for start in range(0, len(items), MAX_ATTACHED):
+            batch = items[start:start + MAX_ATTACHED]
+            for i, (_, path) in enumerate(batch):
+                conn.execute("ATTACH DATABASE ? AS ?", (path, f"t{i}"))
+            try:
+                stale = [path for i, (_, path) in enumerate(batch)
+                         if conn.execute(f"PRAGMA t{i}.user_version").fetchone()[0] < latest]
+                for tenant, path in batch:
+                    if path in stale:
+                        try:
+                            get_db(path)
+                        except DuplicateSuppliersError:
+                            needs_compaction.append(tenant)
+                ready = [(i, tenant) for i, (tenant, _) in enumerate(batch) if tenant not in needs_compaction]
+                if ready:
+                    sql = " UNION ALL ".join(f"SELECT ? AS tenant, * FROM t{i}.{table}" for i, _ in ready)
+                    frames.append(pd.read_sql_query(sql, conn, params=[tenant for _, tenant in ready]))
+            finally:
+                for i in range(len(batch)):
+                    conn.execute(f"DETACH DATABASE t{i}")
+    finally:
+        conn.close()
+    if frames:
+        rollup = pd.concat(frames, ignore_index=True)
+    else:
+        rollup = pd.DataFrame(columns=["tenant", "period", "location_country", "deforestation_risk", "suppliers",
+                                       "total_cost", "total_emissions", "recyclable"])
+    rollup.attrs["needs_compaction"] = needs_compaction
+    return rollup
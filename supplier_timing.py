@@ -0,0 +1,129 @@
+# Lightweight per-rerun timing spans, optional cProfile capture and file exporters
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# Set to a *.jsonl path to append one record per rerun, or *.prom for a
+# Prometheus textfile-collector file with cumulative per-stage totals.
+EXPORT_PATH = os.environ.get("SUPPLIER_TIMING_EXPORT")
+PROFILE_LINES = 30
+
+# Streamlit runs every session's script in its own thread
+_local = threading.local()
+_totals = {}
+_totals_lock = threading.Lock()
+
+
+def start_rerun(app, profile=False):
+    """Begin a new timing record for this thread (call at the top of the script).
+
+    Only one cProfile profiler can be active per process (enforced from
+    Python 3.12), so with `profile` set while another session is being
+    profiled this rerun is timed but not profiled, and the record says so.
+    """
+    # a rerun interrupted before finish_rerun leaves its profiler running
+    leftover = getattr(_local, "profiler", None)
+    if leftover is not None:
+        leftover.disable()
+    _local.record = {"app": app, "started": time.perf_counter(), "spans": [], "depth": 0}
+    _local.profiler = None
+    if profile:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            _local.record["profile"] = "Not profiled: another session is being profiled. Try the next rerun."
+        else:
+            _local.profiler = profiler
+
+
+def _current():
+    return getattr(_local, "record", None)
+
+
+@contextmanager
+def span(name):
+    """Time a stage of the current rerun; nested spans are indented in the report.
+
+    Does nothing (beyond the timing itself) outside start_rerun, so shared
+    modules can be instrumented without depending on Streamlit.
+    """
+    record = _current()
+    if record is None:
+        yield
+        return
+    entry = {"name": name, "depth": record["depth"], "seconds": 0.0}
+    record["spans"].append(entry)
+    record["depth"] += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        entry["seconds"] = time.perf_counter() - start
+        record["depth"] -= 1
+
+
+def finish_rerun(export_path=EXPORT_PATH):
+    """Close the current record, export it if configured and return it (None if not started)."""
+    record = _current()
+    if record is None or "total" in record:
+        return record
+    record["total"] = time.perf_counter() - record["started"]
+    record["timestamp"] = datetime.now().isoformat(timespec="seconds")
+    profiler = getattr(_local, "profiler", None)
+    if profiler is not None:
+        profiler.disable()
+        text = io.StringIO()
+        pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(PROFILE_LINES)
+        record["profile"] = text.getvalue()
+        _local.profiler = None
+    if export_path:
+        export(record, export_path)
+    return record
+
+
+# --- EXPORTERS ---
+def export(record, path):
+    if path.endswith(".prom"):
+        _export_prometheus(record, path)
+    else:
+        _export_jsonl(record, path)
+
+
+def _export_jsonl(record, path):
+    line = json.dumps({
+        "timestamp": record["timestamp"],
+        "app": record["app"],
+        "total_seconds": round(record["total"], 6),
+        "spans": [{"name": s["name"], "depth": s["depth"], "seconds": round(s["seconds"], 6)}
+                  for s in record["spans"]],
+    })
+    with _totals_lock, open(path, "a") as f:
+        f.write(line + "\n")
+
+
+def _export_prometheus(record, path):
+    """Rewrite the textfile atomically with cumulative count / sum per (app, stage)."""
+    with _totals_lock:
+        stages = [("total", record["total"])] + [(s["name"], s["seconds"]) for s in record["spans"]]
+        for stage, seconds in stages:
+            count, total = _totals.get((record["app"], stage), (0, 0.0))
+            _totals[(record["app"], stage)] = (count + 1, total + seconds)
+        lines = [
+            "# HELP supplier_stage_seconds Wall time spent per app stage.",
+            "# TYPE supplier_stage_seconds summary",
+        ]
+        for (app, stage), (count, total) in sorted(_totals.items()):
+            labels = f'app="{app}",stage="{stage}"'
+            lines.append(f"supplier_stage_seconds_sum{{{labels}}} {total:.6f}")
+            lines.append(f"supplier_stage_seconds_count{{{labels}}} {count}")
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, path)
@@ -0,0 +1,472 @@
+# Streamlit building blocks shared by the supplier apps
+import math
+from concurrent.futures import wait
+
+import pandas as pd
+import streamlit as st
+
+from supplier_calc import compute_supplier_totals
+from supplier_db import (
+    GRID_COLUMNS, RISK_LEVELS, RISK_NAMES, SORTABLE_COLUMNS, SUPPLIER_COLUMNS, constraint_predicates,
+    count_suppliers, decode_for_display, explain_empty_shortlist, load_rollup, query_suppliers_page, submit_supplier,
+)
+from supplier_timing import finish_rerun, span
+
+# Feature modules (Monte Carlo, segments with their process pool, import,
+# geo, tenants) are imported by the render functions that use them, so a
+# page only loads what it draws.
+
+PAGE_SIZES = [25, 50, 100, 250]
+# seconds a form submission waits for the background writer to commit it
+SAVE_TIMEOUT = 30
+# labels for supplier_geo route modes; None leaves missing distances at 0
+ESTIMATE_OPTIONS = {"Road / sea by region": "auto", "Air": "air", "Off": None}
+
+
+# --- TENANTS ---
+def select_tenant(key="tenant"):
+    """Sidebar workspace picker; returns the database path of the chosen tenant.
+
+    ?team=<name> in the URL preselects the workspace.
+    """
+    from supplier_tenants import DEFAULT_TENANT, tenant_db_path, tenant_slug
+
+    tenant = st.sidebar.text_input("Team workspace", value=st.query_params.get("team", DEFAULT_TENANT), key=key,
+                                   help="Each team works in its own database file")
+    st.sidebar.caption(f"Workspace: {tenant_slug(tenant)}")
+    return tenant_db_path(tenant)
+
+
+def render_tenant_overview(key="tenants"):
+    """Admin summary across every tenant database, read from their rollup tables."""
+    from supplier_tenants import aggregate_tenants
+
+    grain = st.radio("Period", ["month", "day"], horizontal=True, key=f"{key}_grain", format_func=str.title)
+    rollup = aggregate_tenants(grain=grain)
+    if rollup.attrs["needs_compaction"]:
+        st.warning(
+            "Left out until duplicate suppliers are merged with "
+            "'python supplier_cli.py --tenant <name> compact': " + ", ".join(rollup.attrs["needs_compaction"])
+        )
+    if rollup.empty:
+        st.info("No tenant has any suppliers yet.")
+        return
+    rollup = rollup.assign(high_risk=rollup["suppliers"].where(rollup["deforestation_risk"] == RISK_LEVELS["High"], 0))
+    measures = ["suppliers", "total_cost", "total_emissions", "recyclable", "high_risk"]
+    per_tenant = rollup.groupby("tenant")[measures].sum()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Tenants", len(per_tenant))
+    col2.metric("Suppliers", f"{int(per_tenant['suppliers'].sum()):,}")
+    col3.metric("Total cost (€)", f"{per_tenant['total_cost'].sum():,.0f}")
+    col4.metric("Total emissions (kg CO₂)", f"{per_tenant['total_emissions'].sum():,.0f}")
+    st.dataframe(pd.DataFrame({
+        "Suppliers": per_tenant["suppliers"],
+        "Total cost (€)": per_tenant["total_cost"],
+        "Total emissions (kg CO₂)": per_tenant["total_emissions"],
+        "Recyclable": per_tenant["recyclable"] / per_tenant["suppliers"],
+        "High deforestation risk": per_tenant["high_risk"] / per_tenant["suppliers"],
+    }).style.format({"Total cost (€)": "{:,.0f}", "Total emissions (kg CO₂)": "{:,.0f}",
+                     "Recyclable": "{:.0%}", "High deforestation risk": "{:.0%}"}))
+    st.markdown(f"#### Emissions added per {grain} and tenant")
+    st.bar_chart(rollup.pivot_table(index="period", columns="tenant", values="total_emissions",
+                                    aggfunc="sum", fill_value=0))
+
+
+# --- SUPPLIER FORM ---
+def render_supplier_form(db_path):
+    """Entry form; a submission is queued for the background writer and waited on."""
+    from supplier_geo import DESTINATION
+
+    with st.form("supplier_form"):
+        st.markdown("### 🧾 General Information")
+        name = st.text_input("Supplier Name")
+        location_city = st.text_input("City")
+        location_country = st.text_input("Country")
+
+        st.markdown("### 💰 Cost")
+        quantity_units = st.number_input("Quantity (units)", min_value=0.0)
+        price_per_unit = st.number_input("Price per Unit (€)", min_value=0.0)
+        unit_weight_kg = st.number_input("Weight per Unit (kg)", min_value=0.0)
+        delivery_cost_sea = st.number_input("Sea Delivery Cost (€/km)", min_value=0.0)
+        delivery_cost_road = st.number_input("Road Delivery Cost (€/km)", min_value=0.0)
+        end_of_life_cost_per_kg = st.number_input("End-of-Life Cost (€/kg)", min_value=0.0)
+
+        st.markdown("### ♻️ Circularity Performance")
+        col1, col2 = st.columns(2)
+        with col1:
+            reusable = st.selectbox("Reusable", ["No", "Yes"])
+        with col2:
+            recyclability = st.selectbox("Recyclability", ["No", "Yes"])
+        recycled_materials = st.selectbox("Recycled Materials", ["No", "Yes"])
+
+        reuse_count = 0.0
+        return_km = 0.0
+        if reusable == "Yes":
+            reuse_count = st.number_input("Number of times used", min_value=1.0)
+            return_km = st.number_input("KM to return point", min_value=0.0)
+
+        st.markdown("### 🧭 Distances")
+        distance_sea_km = st.number_input("Distance by Sea (km)", min_value=0.0)
+        distance_road_km = st.number_input("Distance by Road (km)", min_value=0.0)
+        distance_air_km = st.number_input("Distance by Air (km)", min_value=0.0)
+        estimate = st.selectbox("Estimate distances left at 0", list(ESTIMATE_OPTIONS),
+                                help=f"From the city / country to {DESTINATION}, using the offline gazetteer")
+
+        st.markdown("### 🌱 Environmental Factors")
+        emission_factor_prod = st.number_input("EF Production (kg CO2/unit)", min_value=0.0)
+        emission_factor_sea = st.number_input("EF Sea (kg CO2/tonne.km)", min_value=0.0)
+        emission_factor_road = st.number_input("EF Road (kg CO2/tonne.km)", min_value=0.0)
+        emission_factor_air = st.number_input("EF Air (kg CO2/tonne.km)", min_value=0.0)
+        emission_factor_eol = st.number_input("EF End-of-Life (kg CO2/unit)", min_value=0.0)
+
+        deforestation_risk = st.selectbox("Deforestation Risk", list(RISK_LEVELS))
+
+        submitted = st.form_submit_button("Submit Supplier")
+
+        if submitted:
+            data = {
+                'name': name,
+                'location_city': location_city,
+                'location_country': location_country,
+                'quantity_units': quantity_units,
+                'price_per_unit': price_per_unit,
+                'unit_weight_kg': unit_weight_kg,
+                'distance_sea_km': distance_sea_km,
+                'distance_road_km': distance_road_km,
+                'distance_air_km': distance_air_km,
+                'delivery_cost_sea': delivery_cost_sea,
+                'delivery_cost_road': delivery_cost_road,
+                'end_of_life_cost_per_kg': end_of_life_cost_per_kg,
+                'emission_factor_prod': emission_factor_prod,
+                'emission_factor_sea': emission_factor_sea,
+                'emission_factor_road': emission_factor_road,
+                'emission_factor_air': emission_factor_air,
+                'emission_factor_eol': emission_factor_eol,
+                'deforestation_risk': RISK_LEVELS[deforestation_risk],
+                'reusable': int(reusable == "Yes"),
+                'reuse_count': reuse_count,
+                'return_km': return_km,
+                'recyclability': int(recyclability == "Yes"),
+                'recycled_materials': int(recycled_materials == "Yes")
+            }
+            with span("save supplier"):
+                estimated = _estimate_distances(data, db_path, ESTIMATE_OPTIONS[estimate])
+                data.update(compute_supplier_totals(data))
+                total_cost = data['total_cost']
+                total_emissions = data['total_emissions']
+
+                # queued for the background writer; the Future resolves once the row is durable
+                saved = submit_supplier(data, db_path)
+                with st.spinner("Saving..."):
+                    wait([saved], timeout=SAVE_TIMEOUT)
+            if not saved.done():
+                st.warning("⏳ The database is busy and the supplier is still being saved. "
+                           "Check the table in a moment before submitting it again.")
+            elif saved.exception() is None:
+                _, inserted = saved.result()
+                action = "Saved" if inserted else "Updated existing supplier"
+                st.success(f"✅ {action}! Total Cost: €{total_cost:.2f} | Emissions: {total_emissions:.2f} kg CO2")
+                if estimated:
+                    st.info("📍 Estimated distances: " + ", ".join(
+                        f"{col.split('_')[1]} {km:,.0f} km" for col, km in estimated.items() if km))
+            else:
+                st.error(f"Could not save the supplier: {saved.exception()}")
+
+
+def _estimate_distances(data, db_path, mode):
+    """Fill a form submission's distances from its city / country when all are 0.
+
+    Returns the estimated {column: km}, empty when nothing was filled.
+    """
+    from supplier_geo import DISTANCE_COLUMNS, fill_missing_distances
+
+    if not mode:
+        return {}
+    cols = {col: [data[col]] for col in ["location_city", "location_country"] + DISTANCE_COLUMNS}
+    if not fill_missing_distances(cols, db_path, mode=mode):
+        return {}
+    estimated = {col: float(cols[col][0]) for col in DISTANCE_COLUMNS}
+    data.update(estimated)
+    return estimated
+
+
+def render_bulk_import(db_path):
+    """CSV / Excel upload streamed into the database in chunks, with live progress."""
+    from supplier_geo import DESTINATION
+    from supplier_import import import_suppliers
+
+    uploaded = st.file_uploader("Upload a supplier list (CSV or Excel)", type=["csv", "xlsx"])
+    estimate = st.selectbox("Estimate missing distances", list(ESTIMATE_OPTIONS), key="import_estimate",
+                            help=f"Rows without any distance get estimates from their city / country to {DESTINATION}")
+    if uploaded is not None and st.button("Import Suppliers"):
+        progress = st.empty()
+        with span("bulk import"):
+            report = import_suppliers(
+                uploaded, db_path, filename=uploaded.name, distance_mode=ESTIMATE_OPTIONS[estimate],
+                on_chunk=lambda r: progress.info(
+                    f"Imported {r['imported']} rows ({r['rows_per_sec']:.0f} rows/sec)..."),
+            )
+        progress.success(
+            f"✅ Imported {report['imported']} supplier(s), rejected {report['rejected']} "
+            f"in {report['seconds']:.2f}s ({report['rows_per_sec']:.0f} rows/sec); "
+            f"distances estimated for {report['distances_estimated']}"
+        )
+
+
+# --- SUPPLIER GRID ---
+def render_supplier_grid(db_path, key="grid"):
+    """Paginated supplier table; filtering, sorting and paging run in SQL."""
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        name = st.text_input("Name starts with", key=f"{key}_name")
+    with col2:
+        city = st.text_input("City starts with", key=f"{key}_city")
+    with col3:
+        country = st.text_input("Country", key=f"{key}_country")
+    with col4:
+        risks = st.multiselect("Deforestation Risk", list(RISK_LEVELS), key=f"{key}_risks")
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        sort_by = st.selectbox("Sort by", SORTABLE_COLUMNS, key=f"{key}_sort")
+    with col2:
+        descending = st.checkbox("Descending", value=True, key=f"{key}_desc")
+    with col3:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1, key=f"{key}_page_size")
+    with col4:
+        all_columns = st.checkbox("Show all columns", key=f"{key}_all_columns")
+
+    filters = {"name": name.strip(), "city": city.strip(), "country": country.strip(), "risks": risks}
+    total = count_suppliers(db_path, filters)
+    pages = max(math.ceil(total / page_size), 1)
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages
+    page = st.session_state.get(f"{key}_page", 1)
+    df = query_suppliers_page(
+        db_path, filters, sort_by, descending, page, page_size,
+        columns=SUPPLIER_COLUMNS if all_columns else GRID_COLUMNS,
+    )
+
+    st.dataframe(decode_for_display(df), use_container_width=True, hide_index=True)
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        st.number_input("Page", min_value=1, max_value=pages, step=1, key=f"{key}_page")
+    with col2:
+        st.caption(f"{total} supplier(s) · page {page} of {pages}")
+
+
+# --- SHORTLIST ---
+def render_constraints(key="limits"):
+    """Hard limits applied before ranking; returns (constraints, top_k).
+
+    `constraints` is {} when no limit is set and `top_k` is None for "all".
+    """
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        max_cost = st.number_input("Max total cost (€)", min_value=0.0, value=None,
+                                   placeholder="No limit", key=f"{key}_max_cost")
+    with col2:
+        max_emissions = st.number_input("Max total emissions (kg CO₂)", min_value=0.0, value=None,
+                                        placeholder="No limit", key=f"{key}_max_emissions")
+    with col3:
+        max_risk = st.selectbox("Max deforestation risk", ["Any", "Low", "Medium"], key=f"{key}_max_risk")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        recyclable_only = st.checkbox("Recyclable only", key=f"{key}_recyclable")
+    with col2:
+        reusable_only = st.checkbox("Reusable only", key=f"{key}_reusable")
+    with col3:
+        frontier_only = st.checkbox("Pareto frontier only", key=f"{key}_frontier",
+                                    help="Skip suppliers that another one beats on cost, emissions and risk at once")
+    with col4:
+        top_k = st.number_input("Show top k (0 = all)", min_value=0, value=0, step=1, key=f"{key}_top_k")
+    constraints = {
+        "max_cost": max_cost,
+        "max_emissions": max_emissions,
+        "max_risk": None if max_risk == "Any" else max_risk,
+        "recyclable_only": recyclable_only,
+        "reusable_only": reusable_only,
+        "frontier_only": frontier_only,
+    }
+    return (constraints if constraint_predicates(constraints) else {}), (top_k or None)
+
+
+def render_empty_shortlist(db_path, constraints):
+    """Explain which limits leave no supplier standing."""
+    st.warning("No supplier passes all the limits.")
+    explanation = explain_empty_shortlist(db_path, constraints)
+    st.dataframe(pd.DataFrame({
+        "Limit": [row["constraint"] for row in explanation],
+        "Suppliers passing this limit": [row["passing"] for row in explanation],
+        "Suppliers passing all other limits": [row["passing_without"] for row in explanation],
+    }), hide_index=True)
+    blocking = [row["constraint"] for row in explanation if row["passing_without"]]
+    if blocking:
+        st.caption(f"Relaxing any one of these alone would leave suppliers: {', '.join(blocking)}")
+    else:
+        st.caption("No single limit is to blame; at least two need relaxing.")
+
+
+# --- WEIGHT SENSITIVITY ---
+def render_sensitivity(names, matrix, pairwise_matrix, key="sensitivity"):
+    """Rank stability of every supplier when the AHP comparisons move a few notches."""
+    from supplier_sensitivity import weight_sensitivity
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        mode = st.selectbox("Mode", ["random", "grid"], key=f"{key}_mode")
+    with col2:
+        samples = st.number_input("Weight vectors", min_value=100, max_value=100_000, value=5000,
+                                  step=100, key=f"{key}_samples", disabled=mode == "grid")
+    with col3:
+        notches = st.number_input("Notches (± steps on the 1-9 scale)", min_value=1, max_value=3,
+                                  value=1, key=f"{key}_notches")
+    with col4:
+        top_k = st.number_input("Top k", min_value=1, max_value=20, value=3, key=f"{key}_top_k")
+
+    pairs = len(pairwise_matrix) * (len(pairwise_matrix) - 1) // 2
+    if mode == "grid" and (2 * notches + 1) ** pairs > 200_000:
+        st.warning("The grid is too large at this many notches; use random sampling instead.")
+        return
+    if not st.button("Run sensitivity sweep", key=f"{key}_run"):
+        return
+
+    weights, stats = weight_sensitivity(matrix, pairwise_matrix, n=samples, notches=notches,
+                                        mode=mode, top_k=top_k)
+    table = pd.DataFrame({
+        "name": names,
+        f"P(top {top_k})": stats["top_k_probability"],
+        "P(rank 1)": stats["first_probability"],
+        "Mean Score": stats["mean_score"],
+        "Score Std": stats["score_std"],
+    }).sort_values([f"P(top {top_k})", "Mean Score"], ascending=False)
+    st.caption(f"{len(weights)} weight vectors × {len(names)} suppliers")
+    st.dataframe(table.head(50), hide_index=True)
+
+
+# --- EMISSIONS UNCERTAINTY ---
+def render_monte_carlo(df, weights, key="monte_carlo"):
+    """Monte Carlo over uncertain emission factors: emissions intervals and rank probabilities."""
+    from supplier_montecarlo import DEFAULT_UNCERTAINTY, FACTORS, monte_carlo
+
+    samples = st.number_input("Samples", min_value=1000, max_value=5_000_000, value=100_000,
+                              step=10_000, key=f"{key}_samples")
+    uncertainty = {}
+    columns = st.columns(len(FACTORS))
+    for column, factor in zip(columns, FACTORS):
+        kind, spread = DEFAULT_UNCERTAINTY[factor]
+        with column:
+            spread = st.number_input(f"{factor.replace('emission_factor_', 'EF ').title()} ± %",
+                                     min_value=0, max_value=100, value=int(spread * 100), key=f"{key}_{factor}")
+        uncertainty[factor] = (kind, spread / 100.0)
+    if not st.button("Run Monte Carlo", key=f"{key}_run"):
+        return
+
+    result = monte_carlo(df, weights, samples=samples, uncertainty=uncertainty)
+    probability = result["rank_probability"]
+    table = pd.DataFrame({
+        "name": df["name"].to_numpy(),
+        "Emissions (mean)": result["emissions_mean"],
+        "Emissions 2.5%": result["emissions_ci"][:, 0],
+        "Emissions 97.5%": result["emissions_ci"][:, 1],
+        "Mean Score": result["closeness_mean"],
+        "P(rank 1)": probability[:, 0],
+        f"P(top {min(3, probability.shape[1])})": probability[:, :3].sum(axis=1),
+    }).sort_values("Mean Score", ascending=False)
+    st.caption(f"{result['samples']} samples × {len(df)} suppliers")
+    st.dataframe(table.head(50), hide_index=True)
+    with st.expander("Rank position probabilities"):
+        st.dataframe(pd.DataFrame(probability, index=df["name"].to_numpy(),
+                                  columns=[f"#{i + 1}" for i in range(probability.shape[1])]))
+
+
+# --- SEGMENTED RANKING ---
+def render_segmented_ranking(db_path, weights, key="segments"):
+    """TOPSIS ranking within each market or risk class, with the best N per segment."""
+    from supplier_segments import SEGMENT_COLUMNS, segmented_ranking
+
+    col1, col2 = st.columns(2)
+    with col1:
+        column = st.selectbox("Rank within", SEGMENT_COLUMNS, key=f"{key}_column",
+                              format_func=lambda c: c.replace("_", " ").title())
+    with col2:
+        top_n = st.number_input("Top N per segment", min_value=1, max_value=100, value=3, key=f"{key}_top_n")
+    if not st.button("Rank per segment", key=f"{key}_run"):
+        return
+
+    table = segmented_ranking(db_path, column, weights)
+    st.caption(f"{table[column].nunique()} segments × {len(table)} suppliers; "
+               "scores are only comparable within a segment")
+    st.dataframe(decode_for_display(table[table["Rank"] <= top_n]), hide_index=True)
+
+
+# --- DASHBOARD ---
+def render_dashboard(db_path, key="dashboard"):
+    """Trend and portfolio summaries read from the rollup tables only, never from suppliers."""
+    col1, col2 = st.columns(2)
+    with col1:
+        grain = st.radio("Period", ["month", "day"], horizontal=True, key=f"{key}_grain",
+                         format_func=str.title)
+    rollup = load_rollup(db_path, grain)
+    if rollup.empty:
+        st.info("No suppliers yet.")
+        return
+    rollup = rollup.assign(
+        location_country=rollup["location_country"].replace("", "Unknown"),
+        deforestation_risk=rollup["deforestation_risk"].map(RISK_NAMES).fillna("Unknown"),
+        period=rollup["period"].replace("", "Unknown"),
+    )
+    with col2:
+        country = st.selectbox("Country", ["All"] + sorted(rollup["location_country"].unique()),
+                               key=f"{key}_country")
+    if country != "All":
+        rollup = rollup[rollup["location_country"] == country]
+
+    totals = rollup[["suppliers", "total_cost", "total_emissions", "recyclable"]].sum()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Suppliers", f"{int(totals['suppliers']):,}")
+    col2.metric("Total cost (€)", f"{totals['total_cost']:,.0f}")
+    col3.metric("Total emissions (kg CO₂)", f"{totals['total_emissions']:,.0f}")
+    col4.metric("Recyclable", f"{totals['recyclable'] / totals['suppliers']:.0%}" if totals["suppliers"] else "–")
+
+    trend = rollup.groupby("period")[["total_cost", "total_emissions", "suppliers"]].sum()
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown(f"#### Cost added per {grain}")
+        st.bar_chart(trend["total_cost"])
+    with col2:
+        st.markdown(f"#### Emissions added per {grain}")
+        st.bar_chart(trend["total_emissions"])
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("#### Emissions by country")
+        st.bar_chart(rollup.groupby("location_country")["total_emissions"].sum().sort_values(ascending=False))
+    with col2:
+        st.markdown(f"#### Deforestation risk mix per {grain}")
+        st.bar_chart(rollup.pivot_table(index="period", columns="deforestation_risk", values="suppliers",
+                                        aggfunc="sum", fill_value=0))
+
+
+# --- DEBUG PANEL ---
+def render_timing_panel(key="timing"):
+    """Collapsible per-stage timing of the current rerun; call it last in the script.
+
+    The checkbox state is read by start_rerun at the top of the next rerun,
+    which is then profiled with cProfile.
+    """
+    record = finish_rerun()
+    with st.expander("⏱ Debug: timing for this rerun"):
+        st.checkbox("Profile the next rerun with cProfile", key=f"{key}_profile")
+        if record is None:
+            st.caption("Timing was not started for this rerun.")
+            return
+        total = record["total"]
+        st.caption(f"Rerun total: {total * 1000:.1f} ms")
+        st.dataframe(pd.DataFrame({
+            "Stage": [" " * s["depth"] + s["name"] for s in record["spans"]],
+            "ms": [s["seconds"] * 1000 for s in record["spans"]],
+            "% of rerun": [100 * s["seconds"] / total if total else 0.0 for s in record["spans"]],
+        }).style.format({"ms": "{:.1f}", "% of rerun": "{:.1f}"}), hide_index=True)
+        if "profile" in record:
+            st.code(record["profile"], language=None)
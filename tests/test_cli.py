@@ -0,0 +1,27 @@
+import pytest
+
+from supplier_cli import build_parser
+
+
+@pytest.mark.parametrize("argv", [
+    ["recompute", "--set", "price_per_unit"],
+    ["recompute", "--set", "price_per_unit=abc"],
+])
+def test_recompute_rejects_bad_overrides(argv, capsys):
+    with pytest.raises(SystemExit) as exc:
+        build_parser().parse_args(argv)
+    assert exc.value.code == 2
+    assert "argument --set" in capsys.readouterr().err
+
+
+def test_import_rejects_empty_file(tmp_path, capsys):
+    path = tmp_path / "suppliers.csv"
+    path.write_text("")
+    with pytest.raises(SystemExit):
+        build_parser().parse_args(["import", str(path)])
+    assert "is empty" in capsys.readouterr().err
+
+
+def test_recompute_parses_overrides():
+    args = build_parser().parse_args(["recompute", "--set", "price_per_unit=2.5"])
+    assert dict(args.set) == {"price_per_unit": 2.5}
@@ -0,0 +1,300 @@
+import sqlite3
+import threading
+import uuid
+
+import pytest
+
+import supplier_db
+from supplier_db import RISK_LEVELS
+
+
+@pytest.fixture
+def one_open_database(monkeypatch):
+    monkeypatch.setattr(supplier_db, "MAX_OPEN_DATABASES", 1)
+    yield
+    supplier_db.close_all()
+
+
+def test_held_manager_survives_eviction(tmp_path, one_open_database):
+    with supplier_db.open_db(str(tmp_path / "a.db")) as a:
+        supplier_db.get_db(str(tmp_path / "b.db"))
+        assert not a.closed
+        a.data_version()
+        with a.write() as conn:
+            conn.execute("DELETE FROM suppliers")
+
+
+def test_idle_manager_is_evicted_on_release(tmp_path, one_open_database):
+    with supplier_db.open_db(str(tmp_path / "a.db")) as a:
+        with supplier_db.open_db(str(tmp_path / "b.db")):
+            assert len(supplier_db._managers) == 2
+        assert list(supplier_db._managers) == [str(tmp_path / "a.db")]
+    assert not a.closed
+    supplier_db.get_db(str(tmp_path / "b.db"))
+    assert a.closed
+
+
+def test_version_does_not_repeat_after_reopen(tmp_path, one_open_database):
+    # caches keyed on (db_path, version), such as the chart cache, must not hit across a reopen
+    a, b = str(tmp_path / "a.db"), str(tmp_path / "b.db")
+    before = supplier_db.suppliers_snapshot(a)[1]
+    supplier_db.get_db(b)
+    with supplier_db.open_db(a) as db:
+        # PRAGMA data_version restarts with the new connections; bring it back to the old count
+        for _ in range(10):
+            if db.data_version()[1] >= before[1]:
+                break
+            with db.write() as conn:
+                conn.execute("INSERT INTO suppliers (id, name) VALUES (?, 'late')", (supplier_db.new_id(),))
+        df, after = supplier_db.suppliers_snapshot(a)
+    assert after[1] == before[1] and after != before
+    assert not df.empty
+
+
+def test_migration_does_not_block_other_files(tmp_path, monkeypatch):
+    slow, fast = str(tmp_path / "slow.db"), str(tmp_path / "fast.db")
+    migrating, release = threading.Event(), threading.Event()
+    create_schema = supplier_db._create_schema
+
+    def blocking_create_schema(manager):
+        if manager.db_path == slow:
+            migrating.set()
+            release.wait(5)
+        create_schema(manager)
+
+    monkeypatch.setattr(supplier_db, "_create_schema", blocking_create_schema)
+    opened = []
+    threads = [threading.Thread(target=lambda: opened.append(supplier_db.get_db(slow))) for _ in range(2)]
+    try:
+        threads[0].start()
+        assert migrating.wait(5)
+        threads[1].start()
+        supplier_db.get_db(fast)
+        assert not opened
+    finally:
+        release.set()
+        for thread in threads:
+            thread.join(5)
+    assert len(opened) == 2 and opened[0] is opened[1]
+    supplier_db.close_all()
+
+
+def test_frontier_is_maintained_incrementally_after_a_rebuild(tmp_path):
+    db_path = str(tmp_path / "frontier.db")
+    rows = [("a", 100.0, 50.0, 1), ("b", 120.0, 40.0, 2), ("c", 150.0, 60.0, 3)]
+
+    def insert(*rows):
+        with supplier_db.open_db(db_path) as db, db.write() as conn:
+            conn.executemany(
+                "INSERT INTO suppliers (id, name, total_cost, total_emissions, deforestation_risk) "
+                "VALUES (?, ?, ?, ?, ?)", [(supplier_db.new_id(),) + row for row in rows])
+
+    def stale():
+        with supplier_db.open_db(db_path) as db, db.read() as conn:
+            return conn.execute("SELECT stale FROM supplier_frontier_state").fetchone()[0]
+
+    try:
+        insert(*rows)
+        frontier = supplier_db.frontier_ids(db_path)
+        # "c" is dominated by "a" before and after: the frontier goes stale but does not change
+        with supplier_db.open_db(db_path) as db, db.write() as conn:
+            conn.execute("UPDATE suppliers SET total_cost = 160.0 WHERE name = 'c'")
+        assert stale()
+        assert supplier_db.frontier_ids(db_path) == frontier
+        assert not stale()
+        version = supplier_db.get_db(db_path).data_version()
+        assert supplier_db.frontier_ids(db_path) == frontier
+        assert supplier_db.get_db(db_path).data_version() == version
+        # later inserts go through the trigger again, no rebuild needed
+        insert(("d", 200.0, 70.0, 3), ("e", 90.0, 45.0, 1))
+        assert not stale()
+        assert len(supplier_db.frontier_ids(db_path)) == 2
+    finally:
+        supplier_db.close_all()
+
+
+def supplier(name, **values):
+    data = dict.fromkeys(supplier_db.SUPPLIER_COLUMNS[1:-1], 0)
+    data.update(name=name, location_city="Lyon", location_country="France", **values)
+    return data
+
+
+def test_writer_isolates_bad_submissions(tmp_path):
+    db_path = str(tmp_path / "writer.db")
+    missing_key = supplier("broken")
+    del missing_key["total_cost"]
+    try:
+        futures = [
+            supplier_db.submit_supplier(supplier("good"), db_path),
+            supplier_db.submit_supplier(missing_key, db_path),
+            supplier_db.submit_supplier(supplier("unbindable", total_cost=[1.0]), db_path),
+            supplier_db.submit_supplier(supplier("also good"), db_path),
+        ]
+        assert futures[0].result(10)[1] and futures[3].result(10)[1]
+        assert isinstance(futures[1].exception(10), KeyError)
+        assert futures[2].exception(10) is not None
+        assert supplier_db.submit_supplier(supplier("later"), db_path).result(10)[1]
+        assert supplier_db.count_suppliers(db_path) == 3
+    finally:
+        supplier_db.close_all()
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_crashed_writer_is_replaced(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "writer.db")
+    write = supplier_db.WriteQueue._write
+
+    def crash_once(self, prepared):
+        monkeypatch.setattr(supplier_db.WriteQueue, "_write", write)
+        raise SystemError("writer bug")
+
+    monkeypatch.setattr(supplier_db.WriteQueue, "_write", crash_once)
+    try:
+        assert isinstance(supplier_db.submit_supplier(supplier("first"), db_path).exception(10), RuntimeError)
+        assert supplier_db.submit_supplier(supplier("second"), db_path).result(10)[1]
+    finally:
+        supplier_db.close_all()
+
+
+# the suppliers table as the very first release created it (schema version 0)
+LEGACY_TABLE = """
+    CREATE TABLE suppliers (
+        id TEXT PRIMARY KEY, name TEXT, location_city TEXT, location_country TEXT,
+        quantity_units REAL, price_per_unit REAL, unit_weight_kg REAL,
+        distance_sea_km REAL, distance_road_km REAL, distance_air_km REAL,
+        delivery_cost_sea REAL, delivery_cost_road REAL, end_of_life_cost_per_kg REAL,
+        emission_factor_prod REAL, emission_factor_sea REAL, emission_factor_road REAL,
+        emission_factor_air REAL, emission_factor_eol REAL,
+        deforestation_risk TEXT, deforestation_score INTEGER,
+        reusable TEXT, reuse_count REAL, return_km REAL, recyclability TEXT, recycled_materials TEXT,
+        total_cost REAL, total_emissions REAL, created_at TEXT
+    )
+"""
+
+
+def legacy_database(db_path, rows):
+    """rows: (id, name, city, risk label, reusable, total_cost, created_at); the rest is filled in."""
+    conn = sqlite3.connect(db_path)
+    conn.execute(LEGACY_TABLE)
+    conn.executemany(
+        f"INSERT INTO suppliers VALUES ({', '.join('?' * 28)})",
+        [(id_, name, city, "France") + (1.0,) * 14 + (risk, RISK_LEVELS.get(risk), reusable, 0, 0, "No", "Yes",
+                                                       cost, 2.0, created_at)
+         for id_, name, city, risk, reusable, cost, created_at in rows],
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_legacy_duplicates_wait_for_compaction(tmp_path):
+    db_path = str(tmp_path / "legacy.db")
+    legacy_database(db_path, [
+        ("a", "Acme", "Lyon", "High", "Yes", 1.0, "2020-01-01"),
+        ("b", "ACME", "lyon", "Low", "No", 5.0, "2021-01-01"),
+        ("c", "Beta", "Lyon", "Low", "No", 2.0, "2020-01-01"),
+    ])
+    try:
+        with pytest.raises(supplier_db.DuplicateSuppliersError):
+            supplier_db.init_db(db_path)
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT COUNT(*) FROM suppliers").fetchone()[0] == 3
+        assert supplier_db.schema_version(conn) == 0
+        conn.close()
+
+        report = supplier_db.compact_suppliers(db_path)
+        assert report["removed"] == 1
+        backup = sqlite3.connect(report["backup"])
+        assert backup.execute("SELECT COUNT(*) FROM suppliers").fetchone()[0] == 3
+        backup.close()
+        with supplier_db.open_db(db_path) as db, db.read() as conn:
+            assert sorted(conn.execute("SELECT name, total_cost FROM suppliers")) == [("ACME", 5.0), ("Beta", 2.0)]
+        assert supplier_db.compact_suppliers(db_path)["removed"] == 0
+    finally:
+        supplier_db.close_all()
+
+
+def test_original_layout_is_upgraded(tmp_path):
+    db_path = str(tmp_path / "legacy.db")
+    known = uuid.uuid4()
+    legacy_database(db_path, [
+        (str(known), "Acme", "Lyon", "Medium", "Yes", 10.0, "2021-03-04T10:00:00"),
+        ("not-a-uuid", "Beta", "Paris", None, "No", 20.0, "2021-04-05T10:00:00"),
+    ])
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE suppliers SET deforestation_score = 1 WHERE name = 'Beta'")
+    conn.commit()
+    conn.close()
+    try:
+        with supplier_db.open_db(db_path) as db, db.read() as conn:
+            assert supplier_db.schema_version(conn) == supplier_db.MIGRATIONS[-1][0]
+            rows = {row[1]: row for row in conn.execute(
+                "SELECT id, name, deforestation_risk, reusable, recyclability, recycled_materials, total_cost "
+                "FROM suppliers"
+            )}
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(suppliers)")]
+            assert rows["Acme"] == (known.bytes, "Acme", RISK_LEVELS["Medium"], 1, 0, 1, 10.0)
+            assert len(rows["Beta"][0]) == 16 and rows["Beta"][2:] == (1, 0, 0, 1, 20.0)
+            assert columns == supplier_db.SUPPLIER_COLUMNS
+            assert sorted(conn.execute("SELECT period, suppliers FROM supplier_rollup_monthly")) == [
+                ("2021-03", 1), ("2021-04", 1)]
+        # Beta is dearer but has the lower risk, so neither dominates the other
+        assert supplier_db.frontier_ids(db_path) == {rows["Acme"][0], rows["Beta"][0]}
+    finally:
+        supplier_db.close_all()
+
+
+def test_rollup_triggers_match_a_rebuild(tmp_path):
+    db_path = str(tmp_path / "rollups.db")
+
+    def rollups(conn):
+        return {table: sorted(row[:4] + (round(row[4], 6), round(row[5], 6), row[6])
+                              for row in conn.execute(f"SELECT * FROM {table}"))
+                for table in supplier_db.ROLLUP_TABLES.values()}
+
+    no_country = supplier("c", total_emissions=3.5)
+    no_country["location_country"] = None
+    try:
+        with supplier_db.open_db(db_path) as db:
+            with db.write() as conn:
+                supplier_db.insert_suppliers(conn, [
+                    supplier_db.supplier_row(supplier("a", total_cost=10.0, deforestation_risk=1), "2024-01-05"),
+                    supplier_db.supplier_row(supplier("b", total_cost=20.0, recyclability=1), "2024-01-20"),
+                    supplier_db.supplier_row(no_country, "2024-02-01"),
+                ])
+            # same key: updates a in place, moving it to another risk level
+            assert not supplier_db.save_supplier(supplier("A", total_cost=15.0, deforestation_risk=3), db_path)[1]
+            with db.write() as conn:
+                conn.execute("DELETE FROM suppliers WHERE name = 'b'")
+            with db.write() as conn:
+                maintained = rollups(conn)
+                supplier_db.rebuild_rollups(conn)
+                assert rollups(conn) == maintained
+        assert maintained["supplier_rollup_monthly"] == [
+            ("2024-01", "France", 3, 1, 15.0, 0.0, 0),
+            ("2024-02", "", 0, 1, 0.0, 3.5, 0),
+        ]
+    finally:
+        supplier_db.close_all()
+
+
+def test_upsert_collapses_same_key_case_insensitively(tmp_path):
+    db_path = str(tmp_path / "upsert.db")
+    try:
+        supplier_id, inserted = supplier_db.save_supplier(supplier("Acme", total_cost=1.0), db_path)
+        assert inserted
+        renamed = supplier("ACME", total_cost=2.0)
+        renamed.update(location_city="LYON", location_country="france")
+        assert supplier_db.save_supplier(renamed, db_path) == (supplier_id, False)
+        with supplier_db.open_db(db_path) as db:
+            with db.write() as conn:
+                supplier_db.insert_suppliers(conn, [
+                    supplier_db.supplier_row(supplier("acme", total_cost=3.0)),
+                    supplier_db.supplier_row(supplier("Other", total_cost=4.0)),
+                ])
+            with db.read() as conn:
+                rows = {row[1]: row for row in conn.execute("SELECT id, name, location_city, total_cost FROM suppliers")}
+        # the latest spelling and values win; the id is kept
+        assert sorted(rows) == ["Other", "acme"]
+        assert rows["acme"] == (supplier_id, "acme", "Lyon", 3.0)
+    finally:
+        supplier_db.close_all()
@@ -0,0 +1,14 @@
+import supplier_db
+import supplier_geo
+
+
+def test_cache_is_keyed_on_folded_names(tmp_path):
+    db_path = str(tmp_path / "geo.db")
+    try:
+        km, _ = supplier_geo.cached_great_circle(db_path, ["Paris", "paris ", "PARIS"], ["France", "france", "FRANCE"])
+        assert km[0] == km[1] == km[2]
+        with supplier_db.open_db(db_path) as db, db.read() as conn:
+            origins = conn.execute("SELECT origin_city, origin_country FROM geo_distance_cache").fetchall()
+        assert origins == [("paris", "france")]
+    finally:
+        supplier_db.close_all()
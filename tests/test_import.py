@@ -0,0 +1,36 @@
+import io
+
+import supplier_db
+from supplier_import import import_suppliers
+
+CSV = """name,location_city,location_country,price_per_unit,quantity_units,deforestation_risk,reusable,reuse_count
+Acme,Lyon,France,2.5,100,medium,yes,3
+Blank cells,Lyon,France,,,,,
+,Lyon,France,1,1,Low,No,0
+Bad number,Lyon,France,cheap,1,Low,No,0
+Negative,Lyon,France,-1,1,Low,No,0
+Bad risk,Lyon,France,1,1,Extreme,No,0
+Bad flag,Lyon,France,1,1,Low,Maybe,0
+Not reused,Lyon,France,1,1,Low,No,4
+"""
+
+
+def test_import_validates_and_rejects_rows(tmp_path):
+    db_path = str(tmp_path / "import.db")
+    try:
+        report = import_suppliers(io.StringIO(CSV), db_path, chunksize=3, filename="suppliers.csv",
+                                  distance_mode=None)
+        assert (report["imported"], report["rejected"]) == (3, 5)
+        with supplier_db.open_db(db_path) as db, db.read() as conn:
+            rows = {row[0]: row[1:] for row in conn.execute(
+                "SELECT name, price_per_unit, quantity_units, deforestation_risk, reusable, reuse_count, total_cost "
+                "FROM suppliers"
+            )}
+        assert sorted(rows) == ["Acme", "Blank cells", "Not reused"]
+        assert rows["Acme"][:5] == (2.5, 100.0, supplier_db.RISK_LEVELS["Medium"], 1, 3.0)
+        assert rows["Acme"][5] > 0
+        assert rows["Blank cells"][:5] == (0.0, 0.0, supplier_db.RISK_LEVELS["Low"], 0, 0.0)
+        # reuse figures only count for reusable packaging
+        assert rows["Not reused"][4] == 0.0
+    finally:
+        supplier_db.close_all()
@@ -0,0 +1,75 @@
+import numpy as np
+
+import supplier_db
+from supplier_scoring import IncrementalTopsis, criteria_row, decision_matrix, streaming_topsis, topsis
+
+WEIGHTS = np.array([0.4, 0.3, 0.2, 0.1])
+
+
+def test_insert_moving_ideal_and_nadir():
+    engine = IncrementalTopsis([[100.0, 50.0, 2.0, 1.0], [120.0, 40.0, 3.0, 0.0]])
+    engine.scores(WEIGHTS)
+    # cheaper and dirtier than everyone: moves both the cost ideal and the emissions nadir
+    engine.add([80.0, 70.0, 1.0, 1.0])
+    engine.extend([[200.0, 10.0, 3.0, 0.0], [90.0, 45.0, 2.0, 1.0]])
+    assert np.allclose(engine.scores(WEIGHTS), topsis(engine.matrix, WEIGHTS))
+
+
+def test_insert_inside_current_extremes():
+    engine = IncrementalTopsis([[80.0, 70.0, 1.0, 0.0], [200.0, 10.0, 3.0, 1.0]])
+    engine.scores(WEIGHTS)
+    engine.add([100.0, 50.0, 2.0, 1.0])
+    engine.extend([[150.0, 20.0, 2.0, 0.0], [120.0, 30.0, 3.0, 1.0]])
+    assert not engine._stale
+    assert np.allclose(engine.scores(WEIGHTS), topsis(engine.matrix, WEIGHTS))
+
+
+def test_all_zero_column():
+    engine = IncrementalTopsis([[100.0, 50.0, 2.0, 0.0], [120.0, 40.0, 3.0, 0.0]])
+    engine.scores(WEIGHTS)
+    engine.add([90.0, 60.0, 1.0, 0.0])
+    scores = engine.scores(WEIGHTS)
+    assert not np.isnan(scores).any()
+    assert np.allclose(scores, topsis(engine.matrix, WEIGHTS))
+
+
+def test_streaming_matches_in_memory(tmp_path):
+    db_path = str(tmp_path / "stream.db")
+    rng = np.random.default_rng(7)
+    rows = []
+    for i in range(53):
+        data = dict.fromkeys(supplier_db.SUPPLIER_COLUMNS[1:-1], 0)
+        data.update(name=f"s{i}", location_city="Lyon", location_country="France",
+                    total_cost=rng.uniform(1e3, 1e6), total_emissions=rng.uniform(10, 5e4),
+                    deforestation_risk=int(rng.integers(1, 4)), recyclability=int(rng.integers(0, 2)))
+        if i % 10 == 0:
+            # NULLs take the CRITERIA_SQL defaults in both paths
+            data.update(total_cost=None, deforestation_risk=None)
+        rows.append(supplier_db.supplier_row(data))
+    try:
+        with supplier_db.open_db(db_path) as db, db.write() as conn:
+            supplier_db.insert_suppliers(conn, rows)
+        names, matrix = supplier_db.load_decision_matrix(db_path)
+        expected = topsis(matrix, WEIGHTS)
+        for dtype, rtol in ((np.float64, 1e-12), (np.float32, 1e-4)):
+            blocks = list(streaming_topsis(db_path, WEIGHTS, chunk_rows=10, dtype=dtype))
+            assert len(blocks) == 6
+            assert [name for block_names, _ in blocks for name in block_names] == names
+            scores = np.concatenate([closeness for _, closeness in blocks])
+            assert np.allclose(scores, expected, rtol=rtol, atol=0)
+    finally:
+        supplier_db.close_all()
+
+
+def test_encoders_share_null_defaults(tmp_path):
+    db_path = str(tmp_path / "nulls.db")
+    data = dict.fromkeys(supplier_db.SUPPLIER_COLUMNS[1:-1], None)
+    data.update(name="blank", location_city="Lyon", location_country="France")
+    try:
+        supplier_db.save_supplier(data, db_path)
+        _, from_sql = supplier_db.load_decision_matrix(db_path)
+        from_frame = decision_matrix(supplier_db.load_suppliers(db_path))
+        assert np.array_equal(from_frame, from_sql)
+        assert np.array_equal(from_sql[0], criteria_row(data))
+    finally:
+        supplier_db.close_all()